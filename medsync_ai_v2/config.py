@@ -70,6 +70,37 @@ def get_agent_config(agent_name: str) -> dict:
     return {"provider": provider, "model": model}
 
 
+# Build the orchestrator tool registry at import time (container boot) instead
+# of on the first request — useful for serverless cold starts
+EAGER_REGISTRY = os.getenv("MEDSYNC_EAGER_REGISTRY", "").lower() in ("1", "true", "yes")
+
+# Let IntentClassifier answer confident single-intent queries with the local
+# embedding model instead of the LLM. Off until its thresholds are measured
+# on a held-out labeled set
+LOCAL_INTENT_CLASSIFIER = os.getenv("LOCAL_INTENT_CLASSIFIER", "").lower() in ("1", "true", "yes")
+
+# Steps 3+4 sub-agent timeouts (ms). Unset = adaptive (multiple of observed p95);
+# on timeout the orchestrator falls back (intent "general" / no devices)
+INTENT_TIMEOUT_MS = int(os.getenv("INTENT_TIMEOUT_MS", "0")) or None
+EXTRACT_TIMEOUT_MS = int(os.getenv("EXTRACT_TIMEOUT_MS", "0")) or None
+
+# Hedged LLM requests: if a call_json request hasn't returned after this many
+# milliseconds, send a duplicate and take whichever finishes first (0 = off)
+LLM_HEDGE_AFTER_MS = int(os.getenv("LLM_HEDGE_AFTER_MS", "0")) or None
+
+# Anthropic prompt caching for system prompts (SKILL.md prompts are static per
+# agent; OpenAI caches long prompt prefixes automatically)
+ANTHROPIC_PROMPT_CACHE = os.getenv("ANTHROPIC_PROMPT_CACHE", "").lower() in ("1", "true", "yes")
+
+# Output-agent streaming: coalesce LLM tokens into one final_chunk event per
+# this many milliseconds (or 8 tokens, whichever comes first). 0 = per token
+STREAM_BATCH_MS = int(os.getenv("STREAM_BATCH_MS", "0"))
+
+
+# Level for the medsync_ai_v2 loggers (DEBUG adds per-step detail lines)
+LOG_LEVEL = os.getenv("MEDSYNC_LOG_LEVEL", "INFO").upper()
+
+
 # AIS Guidelines Vector Store (clinical_support_engine)
 AIS_GUIDELINES_VECTOR_STORE_ID = os.getenv("AIS_GUIDELINES_VECTOR_STORE_ID")
 
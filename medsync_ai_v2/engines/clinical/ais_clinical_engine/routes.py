@@ -20,7 +20,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-from medsync_ai_v2.shared.session_state import SessionManager, sanitize_for_firestore
+from medsync_ai_v2.shared.session_state import SessionManager, append_turn, sanitize_for_firestore
 
 from .agents.ivt_orchestrator import IVTOrchestrator
 from .data.loader import (
@@ -112,12 +112,12 @@ async def _save_clinical_context(
     if scenario_text and not any(
         m.get("content") == scenario_text for m in session_state["conversation_history"]
     ):
-        session_state["conversation_history"].append({
+        append_turn(session_state, {
             "role": "user",
             "content": scenario_text,
             "timestamp": now,
         })
-        session_state["conversation_history"].append({
+        append_turn(session_state, {
             "role": "assistant",
             "content": decision_state.headline or "Clinical evaluation complete",
             "type": "clinical_evaluation",
@@ -160,8 +160,17 @@ def map_device_categories(categories: list) -> dict:
     return result
 
 
+def group_by_field(database, field):
+    """One pass over the database: field value -> list of device records (in DB order)."""
+    groups = {}
+    for device in database.values():
+        groups.setdefault(device.get(field), []).append(device)
+    return groups
+
+
 def get_products_for_category(database, category_mapping):
     category_to_products = {}
+    by_category_type = None
     for category_name, config in category_mapping.items():
         # Shortcut: pre-resolved products (from DB filter via prior_results)
         pre_resolved = config.get('products')
@@ -169,11 +178,13 @@ def get_products_for_category(database, category_mapping):
             category_to_products[category_name] = list(pre_resolved)
             continue
 
-        # Standard path: scan full database by device_categories
-        device_categories = config.get('device_categories', [])
+        # Standard path: look up device_categories in a category_type index
+        # (built once, instead of scanning the full database per category)
+        if by_category_type is None:
+            by_category_type = group_by_field(database, 'category_type')
         product_names = set()
-        for uid, device in database.items():
-            if device.get('category_type') in device_categories:
+        for category_type in config.get('device_categories', []):
+            for device in by_category_type.get(category_type, ()):
                 product_name = device.get('product_name')
                 if product_name:
                     product_names.add(product_name)
@@ -211,14 +222,16 @@ def update_devices_lookup(existing_devices, expanded_chains, database):
         for prod in chain.get('sequence', []):
             all_products.add(prod)
     new_products = all_products - set(existing_devices.keys())
+    if not new_products:
+        return {'devices': existing_devices}
+    by_product_name = group_by_field(database, 'product_name')
     for product_name in new_products:
         ids = []
         conical_category = None
-        for uid, device in database.items():
-            if device.get('product_name') == product_name:
-                ids.append(str(device.get('id')))
-                if conical_category is None:
-                    conical_category = device.get('conical_category')
+        for device in by_product_name.get(product_name, ()):
+            ids.append(str(device.get('id')))
+            if conical_category is None:
+                conical_category = device.get('conical_category')
         if ids:
             existing_devices[product_name] = {'ids': ids, 'conical_category': conical_category}
     return {'devices': existing_devices}
@@ -11,10 +11,61 @@ Ported from vs2 MultipleConstraintsGetChainsAgentOutput.
 import os
 import json
 from datetime import datetime, timezone
+from medsync_ai_v2 import config
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.shared.stream_batching import batch_stream
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
 
+# Prompt-size guards against pathological engine output: ~8K tokens of
+# summary, and the first valid N-1 subsets (one per removed device per chain)
+_MAX_SUMMARY_CHARS = 32000
+_MAX_SUBSETS = 20
+
+# Instructions for result types without a reference file
+_DEFAULT_INSTRUCTIONS = """
+TASK: Provide compatibility analysis.
+
+FORMAT:
+- For single device or 2-device checks: Use inline prose
+- For multiple devices (3+): Use markdown table
+- For comparisons: Use side-by-side table
+
+| Spec | Device A | Device B |
+|------|----------|----------|
+| ID | 0.021" | 0.017" |
+| OD | 0.026" | 0.029" |
+
+MULTI-SIZE HANDLING:
+- Always present the full range of specifications across all sizes
+- Never cherry-pick just one size's specs
+
+LANGUAGE RULES:
+- Stay neutral - no marketing language
+- Present specifications objectively
+"""
+
+# key -> (section heading, heading that ends it, prefix) in response_framing.md / query_modes.md
+_FRAMING_SECTIONS = {
+    "negative": ("## Negative Framing", "## Positive Framing", "\nNOTE: "),
+    "positive": ("## Positive Framing", "## Neutral Framing", "\nNOTE: "),
+}
+_MODE_SECTIONS = {
+    "discovery": ("## Discovery Mode", "## Comparison Mode", "\nMODE: Discovery - "),
+    "comparison": ("## Comparison Mode", "## Default Mode", "\nMODE: Comparison - "),
+}
+
+
+def _reference_notes(content: str, sections: dict) -> dict:
+    """Extract each section present in a reference file as a prefixed note."""
+    notes = {}
+    for key, (heading, next_heading, prefix) in sections.items():
+        if heading in content:
+            start = content.index(heading)
+            end = content.index(next_heading) if next_heading in content else len(content)
+            notes[key] = prefix + content[start:end].replace(heading + "\n", "").strip()
+    return notes
+
 
 class ChainOutputAgent(LLMAgent):
     """Formats chain engine results into user-facing markdown responses."""
@@ -22,6 +73,7 @@ class ChainOutputAgent(LLMAgent):
     def __init__(self):
         super().__init__(name="chain_output_agent", skill_path=SKILL_PATH)
         self._refs = {}
+        self._system_messages = {}
         self._load_references()
 
     def _load_references(self):
@@ -41,6 +93,17 @@ class ChainOutputAgent(LLMAgent):
                 with open(path, "r", encoding="utf-8") as f:
                     self._refs[name] = f.read()
 
+        # Slice the references into per-key fragments once
+        self._sub_type_instructions = {
+            "compatibility_check": self._refs.get("compatibility_check", ""),
+            "stack_validation": self._refs.get("stack_validation", ""),
+        }
+        discovery_parts = self._refs.get("device_discovery", "").split("# Device Discovery - Few Results")
+        self._discovery_many = discovery_parts[0]
+        self._discovery_few = discovery_parts[1] if len(discovery_parts) > 1 else discovery_parts[0]
+        self._framing_notes = _reference_notes(self._refs.get("response_framing", ""), _FRAMING_SECTIONS)
+        self._mode_notes = _reference_notes(self._refs.get("query_modes", ""), _MODE_SECTIONS)
+
     def _build_system_message(self, input_data: dict) -> str:
         """Build system message dynamically based on classification context."""
 
@@ -49,89 +112,45 @@ class ChainOutputAgent(LLMAgent):
         query_mode = classification.get("query_mode", "exploratory")
         response_framing = input_data.get("response_framing", classification.get("framing", "neutral"))
 
-        flat_data = input_data.get("flat_data", [])
-        device_count = len(flat_data)
+        # Only the multi-result discovery prompt mentions the device count
+        device_count = len(input_data.get("flat_data", []))
+        if result_type != "device_discovery" or device_count < 3:
+            device_count = 0
 
-        # ----------------------------------------------------------
-        # Base context from SKILL.md
-        # ----------------------------------------------------------
-        base_context = self.system_message
+        key = (result_type, query_mode, response_framing, device_count)
+        system_message = self._system_messages.get(key)
+        if system_message is None:
+            system_message = self._system_messages[key] = self._compose_system_message(*key)
+        return system_message
+
+    def _compose_system_message(
+        self, result_type: str, query_mode: str, response_framing: str, device_count: int,
+    ) -> str:
+        """Compose the system message from SKILL.md and the references (memoized by the caller).
+
+        device_count is 0 unless this is a device_discovery with 3+ results.
+        """
 
         # ----------------------------------------------------------
         # Sub-type specific instructions from references
         # ----------------------------------------------------------
-        if result_type == "compatibility_check":
-            sub_type_instructions = self._refs.get("compatibility_check", "")
-
-        elif result_type == "device_discovery":
-            discovery_content = self._refs.get("device_discovery", "")
-            if device_count >= 3:
+        if result_type == "device_discovery":
+            if device_count:
                 # Use the multiple results section - inject device count
-                sub_type_instructions = discovery_content.split("# Device Discovery - Few Results")[0]
-                sub_type_instructions = sub_type_instructions.replace(
+                sub_type_instructions = self._discovery_many.replace(
                     "Use a markdown table for multiple results:",
                     f"Use a markdown table for {device_count} results:"
                 )
             else:
-                # Use the few results section
-                parts = discovery_content.split("# Device Discovery - Few Results")
-                sub_type_instructions = parts[1] if len(parts) > 1 else discovery_content
-
-        elif result_type == "stack_validation":
-            sub_type_instructions = self._refs.get("stack_validation", "")
-
+                sub_type_instructions = self._discovery_few
         else:
-            sub_type_instructions = """
-TASK: Provide compatibility analysis.
+            sub_type_instructions = self._sub_type_instructions.get(result_type, _DEFAULT_INSTRUCTIONS)
 
-FORMAT:
-- For single device or 2-device checks: Use inline prose
-- For multiple devices (3+): Use markdown table
-- For comparisons: Use side-by-side table
+        # Response framing and query mode adjustments from references
+        framing_note = self._framing_notes.get(response_framing, "")
+        mode_note = self._mode_notes.get(query_mode, "")
 
-| Spec | Device A | Device B |
-|------|----------|----------|
-| ID | 0.021" | 0.017" |
-| OD | 0.026" | 0.029" |
-
-MULTI-SIZE HANDLING:
-- Always present the full range of specifications across all sizes
-- Never cherry-pick just one size's specs
-
-LANGUAGE RULES:
-- Stay neutral - no marketing language
-- Present specifications objectively
-"""
-
-        # ----------------------------------------------------------
-        # Response framing adjustments from references
-        # ----------------------------------------------------------
-        framing_content = self._refs.get("response_framing", "")
-        framing_note = ""
-        if response_framing == "negative" and "## Negative Framing" in framing_content:
-            start = framing_content.index("## Negative Framing")
-            end = framing_content.index("## Positive Framing") if "## Positive Framing" in framing_content else len(framing_content)
-            framing_note = "\nNOTE: " + framing_content[start:end].replace("## Negative Framing\n", "").strip()
-        elif response_framing == "positive" and "## Positive Framing" in framing_content:
-            start = framing_content.index("## Positive Framing")
-            end = framing_content.index("## Neutral Framing") if "## Neutral Framing" in framing_content else len(framing_content)
-            framing_note = "\nNOTE: " + framing_content[start:end].replace("## Positive Framing\n", "").strip()
-
-        # ----------------------------------------------------------
-        # Query mode adjustments from references
-        # ----------------------------------------------------------
-        modes_content = self._refs.get("query_modes", "")
-        mode_note = ""
-        if query_mode == "discovery" and "## Discovery Mode" in modes_content:
-            start = modes_content.index("## Discovery Mode")
-            end = modes_content.index("## Comparison Mode") if "## Comparison Mode" in modes_content else len(modes_content)
-            mode_note = "\nMODE: Discovery - " + modes_content[start:end].replace("## Discovery Mode\n", "").strip()
-        elif query_mode == "comparison" and "## Comparison Mode" in modes_content:
-            start = modes_content.index("## Comparison Mode")
-            end = modes_content.index("## Default Mode") if "## Default Mode" in modes_content else len(modes_content)
-            mode_note = "\nMODE: Comparison - " + modes_content[start:end].replace("## Comparison Mode\n", "").strip()
-
-        return f"{base_context}\n{sub_type_instructions}\n{framing_note}\n{mode_note}".strip()
+        return f"{self.system_message}\n{sub_type_instructions}\n{framing_note}\n{mode_note}".strip()
 
     def _format_subset(self, subset_analysis) -> str:
         """Format N-1 subset results for inclusion in the LLM prompt."""
@@ -140,13 +159,32 @@ LANGUAGE RULES:
             subsets = subset_analysis
         else:
             subsets = subset_analysis.get("subsets", [])
+        # run_n1_subsets() yields removed_device / subset_sequence; older
+        # results used excluded_device / chain_path
+        seen = set()
+        invalid = []
+        shown = 0
         for subset in subsets:
-            excluded = subset.get("excluded_device", "unknown")
-            status = subset.get("status", "unknown")
-            label = "Valid" if status == "pass" else "Invalid"
-            lines.append(f"  Excluding {excluded}: {label}")
-            if status == "pass" and subset.get("chain_path"):
-                lines.append(f"    Order: {' -> '.join(subset['chain_path'])}")
+            excluded = subset.get("removed_device", subset.get("excluded_device", "unknown"))
+            path = subset.get("subset_sequence") or subset.get("chain_path") or ()
+            key = (excluded, tuple(path))
+            if key in seen:
+                continue
+            seen.add(key)
+            if subset.get("status") != "pass":
+                # One line for all still-invalid removals
+                invalid.append(excluded)
+                continue
+            shown += 1
+            if shown > _MAX_SUBSETS:
+                continue
+            lines.append(f"  Excluding {excluded}: Valid")
+            if path:
+                lines.append(f"    Order: {' -> '.join(path)}")
+        if shown > _MAX_SUBSETS:
+            lines.append(f"  ... {shown - _MAX_SUBSETS} more valid subset configurations omitted")
+        if invalid:
+            lines.append(f"  Still invalid when excluding: {', '.join(dict.fromkeys(invalid))}")
         return "\n".join(lines) if lines else "No subset data available."
 
     async def run(self, input_data: dict, session_state: dict, broker=None) -> dict:
@@ -161,12 +199,17 @@ LANGUAGE RULES:
         # Build user prompt with rich compatibility analysis
         user_query = input_data.get("user_query", "")
         text_summary = input_data.get("text_summary", "")
-        user_prompt = f"User Question: {user_query}\n\nCompatibility Analysis:\n\n{text_summary}"
+        if len(text_summary) > _MAX_SUMMARY_CHARS:
+            # Cut at a line boundary; the full summary stays in the engine result
+            cut = text_summary.rfind("\n", 0, _MAX_SUMMARY_CHARS)
+            text_summary = text_summary[:cut if cut > 0 else _MAX_SUMMARY_CHARS] + "\n...[truncated]"
+        parts = [f"User Question: {user_query}", "Compatibility Analysis:", text_summary]
 
         # Append subset analysis for N-1 scenarios
         subset = input_data.get("subset_analysis")
         if subset:
-            user_prompt += f"\n\nN-1 Subset Configurations:\n{self._format_subset(subset)}"
+            parts.append(f"N-1 Subset Configurations:\n{self._format_subset(subset)}")
+        user_prompt = "\n\n".join(parts)
 
         messages = [{"role": "user", "content": user_prompt}]
 
@@ -175,11 +218,12 @@ LANGUAGE RULES:
             final_text = ""
             usage = {"input_tokens": 0, "output_tokens": 0}
 
-            async for chunk in self.llm_client.call_stream(
+            stream = self.llm_client.call_stream(
                 system_prompt=system_message,
                 messages=messages,
                 model=self.model,
-            ):
+            )
+            async for chunk in batch_stream(stream, config.STREAM_BATCH_MS / 1000):
                 if isinstance(chunk, dict):
                     usage = chunk
                 else:
@@ -189,7 +233,8 @@ LANGUAGE RULES:
                         "data": {
                             "agent": self.name,
                             "content": chunk,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            # Formatted by orjson at the SSE layer (same ISO string as isoformat())
+                            "timestamp": datetime.now(timezone.utc),
                         },
                     })
 
@@ -7,11 +7,24 @@ Includes fuzzy match suggestions when available.
 """
 
 import os
+import logging
 from datetime import datetime, timezone
+from medsync_ai_v2 import config
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.shared.stream_batching import batch_stream
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
 
+logger = logging.getLogger(__name__)
+
+
+def _bold_list(items: list, conjunction: str) -> str:
+    """Bold and join: **A** / **A** or **B** / **A**, **B**, or **C**."""
+    bold = [f"**{item}**" for item in items]
+    if len(bold) <= 2:
+        return f" {conjunction} ".join(bold)
+    return f"{', '.join(bold[:-1])}, {conjunction} {bold[-1]}"
+
 
 class ClarificationOutputAgent(LLMAgent):
     """Generates clarification messages for unresolved device names."""
@@ -25,20 +38,39 @@ class ClarificationOutputAgent(LLMAgent):
         not_found = input_data.get("not_found", [])
         suggestions = input_data.get("suggestions", {})
 
+        logger.debug("[ClarificationOutputAgent] not_found=%s, resolved=%s", not_found, resolved)
+
+        # Nothing unresolved, or one unknown name with close matches: the
+        # wording is fixed, so answer from the template without a model round-trip
+        template = self._template_response(resolved, not_found, suggestions)
+        if template is not None:
+            if broker:
+                await broker.put({
+                    "type": "final_chunk",
+                    "data": {
+                        "agent": self.name,
+                        "content": template,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                })
+            return {
+                "content": {"formatted_response": template},
+                "usage": {"input_tokens": 0, "output_tokens": 0},
+            }
+
         user_prompt = self._build_user_prompt(user_query, resolved, not_found, suggestions)
         messages = [{"role": "user", "content": user_prompt}]
 
-        print(f"  [ClarificationOutputAgent] not_found={not_found}, resolved={resolved}")
-
         if broker:
             final_text = ""
             usage = {"input_tokens": 0, "output_tokens": 0}
 
-            async for chunk in self.llm_client.call_stream(
+            stream = self.llm_client.call_stream(
                 system_prompt=self.system_message,
                 messages=messages,
                 model=self.model,
-            ):
+            )
+            async for chunk in batch_stream(stream, config.STREAM_BATCH_MS / 1000):
                 if isinstance(chunk, dict):
                     usage = chunk
                 else:
@@ -48,7 +80,8 @@ class ClarificationOutputAgent(LLMAgent):
                         "data": {
                             "agent": self.name,
                             "content": chunk,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            # Formatted by orjson at the SSE layer (same ISO string as isoformat())
+                            "timestamp": datetime.now(timezone.utc),
                         },
                     })
 
@@ -67,6 +100,28 @@ class ClarificationOutputAgent(LLMAgent):
                 "usage": response.get("usage", {}),
             }
 
+    @staticmethod
+    def _template_response(resolved, not_found, suggestions):
+        """Clarification for no or a single unresolved name with suggestions, else None."""
+        if not not_found:
+            # Upstream only routes here with unresolved names; don't ask the model
+            return "All device names were resolved, so no clarification is needed."
+        if len(not_found) != 1:
+            return None
+        name = not_found[0]
+        matches = [m["product_name"] for m in (suggestions or {}).get(name, [])[:3]]
+        if not matches:
+            return None
+
+        if resolved:
+            text = f"I found {_bold_list(resolved, 'and')}, but I couldn't find **{name}** in the database."
+        else:
+            text = f"I couldn't find **{name}** in the database."
+
+        if len(matches) == 1:
+            return f"{text} Did you mean **{matches[0]}**?"
+        return f"{text} Did you mean one of these: {_bold_list(matches, 'or')}?"
+
     def _build_user_prompt(self, user_query, resolved, not_found, suggestions):
         parts = [f"User's original question: {user_query}"]
 
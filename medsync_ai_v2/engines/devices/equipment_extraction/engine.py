@@ -100,7 +100,7 @@ class EquipmentExtraction(LLMAgent):
         if constraints:
             print(f"  [EquipmentExtraction] Constraints: {constraints}")
 
-        return {
+        result = {
             "content": {
                 "devices": devices,
                 "categories": device_categories,
@@ -113,3 +113,7 @@ class EquipmentExtraction(LLMAgent):
                 "output_tokens": response.get("output_tokens", 0),
             },
         }
+        if "raw_text" in extraction:
+            # Parse failure: usable for this turn, not worth caching
+            result["degraded"] = "JSON parse failed"
+        return result
@@ -4,14 +4,50 @@ Generic Prep Agent
 Analyzes structured generic device descriptions and determines if there's
 enough information to search the database. Maps device attributes to
 database field names.
+
+Devices are resolved deterministically by generic_prep_rules; only the
+ambiguous ones (unknown device_type/units, unlocatable context) go to the LLM.
+SKILL.md is a compact schema + rules + examples prompt; the full decision
+tables in references/ document generic_prep_rules and are not sent to the LLM.
+LLM fallbacks arriving from concurrent sessions within a short window are
+micro-batched into a single call and demultiplexed by a per-request tag.
+Mixing sessions in one prompt is acceptable for this data: GenericPrep only
+runs on the equipment path (clinical queries are redirected before Step 3),
+so the prompt holds device-compatibility questions and device descriptions,
+sent to the same provider account either way, and nothing from a batch is
+stored. Each caller only takes items carrying its own tag, and a caller
+whose item count doesn't match what it sent is re-run alone.
+Prompts are canonical JSON (sorted keys, devices sorted by raw text) so
+identical requests are byte-identical for prompt/response caching.
 """
 
 import os
-import json
+import asyncio
+import logging
+import orjson
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.shared.agent_schemas import GenericPrepOut, validate_output
+from medsync_ai_v2.engines.devices.generic_prep.generic_prep_rules import resolve_generic_device
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
-REFS_DIR = os.path.join(os.path.dirname(__file__), "references")
+
+logger = logging.getLogger(__name__)
+
+# Micro-batching: collect LLM fallbacks for up to BATCH_WINDOW_S or BATCH_MAX_REQUESTS
+BATCH_WINDOW_S = 0.02
+BATCH_MAX_REQUESTS = 8
+
+# Device the LLM left out of its output (dropped or mangled)
+REASON_NOT_EVALUATED = "We couldn't evaluate this device."
+
+BATCH_PROMPT_ADDENDUM = """
+
+## Batched Input
+
+This request combines several user questions. `original_question` is an object
+mapping a tag to each question, and every item in `generic_devices` carries a
+`batch_tag` naming the question it came from. Evaluate each device against its
+own question, and copy its `batch_tag` unchanged into the matching output item."""
 
 
 class GenericPrep(LLMAgent):
@@ -19,22 +55,15 @@ class GenericPrep(LLMAgent):
 
     def __init__(self):
         super().__init__(name="generic_prep", skill_path=SKILL_PATH)
-        self._load_references()
-
-    def _load_references(self):
-        """Load field mapping and resolution rules into system prompt."""
-        for ref_file in ["field_mapping.md", "resolution_rules.md"]:
-            ref_path = os.path.join(REFS_DIR, ref_file)
-            if os.path.exists(ref_path):
-                with open(ref_path, "r", encoding="utf-8") as f:
-                    refs = f.read()
-                self.system_message += "\n\n" + refs
+        self._batch_queue = None
+        self._batch_worker = None
+        self._batch_tasks = set()
 
     async def run(self, input_data: dict, session_state: dict) -> dict:
         original_question = input_data.get("original_question", "")
         generic_devices = input_data.get("generic_devices", [])
 
-        print(f"  [GenericPrep] Evaluating {len(generic_devices)} generic device(s)")
+        logger.debug("[GenericPrep] Evaluating %d generic device(s)", len(generic_devices))
 
         if not generic_devices:
             return {
@@ -42,41 +71,190 @@ class GenericPrep(LLMAgent):
                 "usage": {"input_tokens": 0, "output_tokens": 0},
             }
 
-        user_prompt = json.dumps({
-            "original_question": original_question,
-            "generic_devices": generic_devices,
-        })
+        # Deterministic pass — keep original order, collect LLM fallbacks
+        resolved = [resolve_generic_device(d, original_question) for d in generic_devices]
+        pending = [i for i, r in enumerate(resolved) if r is None]
+        usage = {"input_tokens": 0, "output_tokens": 0}
 
-        messages = [{"role": "user", "content": user_prompt}]
+        if pending:
+            logger.debug("[GenericPrep] %d device(s) need LLM resolution", len(pending))
+            llm_devices, usage = await self._resolve_with_llm(
+                original_question, [generic_devices[i] for i in pending]
+            )
+            for i, d in zip(pending, llm_devices):
+                resolved[i] = d
+            resolved.extend(llm_devices[len(pending):])
 
-        response = await self.llm_client.call_json(
-            system_prompt=self.system_message,
-            messages=messages,
-            model=self.model,
-        )
-
-        content = response.get("content", {})
-        if isinstance(content, str):
-            try:
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                content = {"devices": []}
-
-        devices = content.get("devices", [])
+        devices = [d for d in resolved if d is not None]
         has_insufficient = any(not d.get("has_info", False) for d in devices)
 
-        print(f"  [GenericPrep] Results:")
-        for d in devices:
-            status = "SUFFICIENT" if d.get("has_info") else f"INSUFFICIENT: {d.get('reason', '?')}"
-            print(f"    - {d.get('raw', '?')}: {status}")
+        if logger.isEnabledFor(logging.DEBUG):
+            lines = ["[GenericPrep] Results:"]
+            for d in devices:
+                status = "SUFFICIENT" if d.get("has_info") else f"INSUFFICIENT: {d.get('reason', '?')}"
+                lines.append(f"  - {d.get('raw', '?')}: {status}")
+            logger.debug("\n".join(lines))
 
         return {
             "content": {
                 "devices": devices,
                 "has_insufficient": has_insufficient,
             },
-            "usage": {
-                "input_tokens": response.get("input_tokens", 0),
-                "output_tokens": response.get("output_tokens", 0),
-            },
+            "usage": usage,
+        }
+
+    # ------------------------------------------------------------------
+    # LLM fallback (micro-batched across concurrent sessions)
+    # ------------------------------------------------------------------
+
+    async def _resolve_with_llm(self, original_question: str, devices: list) -> tuple:
+        """Queue devices for the next micro-batch. Resolves to (devices, usage)."""
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._collect_batches())
+
+        # Canonical device order so identical requests produce identical prompts
+        order = sorted(range(len(devices)), key=lambda i: devices[i].get("raw", ""))
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((original_question, [devices[i] for i in order], future))
+        llm_devices, usage = await future
+
+        if len(llm_devices) != len(devices):
+            # The LLM dropped or added items: keep what it returned and flag
+            # each device it skipped, so its spec isn't silently lost
+            returned = [d.get("raw", "") for d in llm_devices]
+            for device in devices:
+                raw = device.get("raw", "")
+                if raw in returned:
+                    returned.remove(raw)
+                else:
+                    llm_devices.append({
+                        "raw": raw,
+                        "has_info": False,
+                        "device_type": device.get("device_type"),
+                        "reason": REASON_NOT_EVALUATED,
+                    })
+            return llm_devices, usage
+
+        # Restore the caller's order (the LLM returned one item per device)
+        restored = [None] * len(devices)
+        for position, i in enumerate(order):
+            restored[i] = llm_devices[position]
+        return restored, usage
+
+    async def _collect_batches(self):
+        """Drain the queue into batches and dispatch each without blocking the next window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_S
+            while len(batch) < BATCH_MAX_REQUESTS:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _dispatch_batch(self, batch: list):
+        """Run one LLM call for the batch and resolve each caller's future."""
+        try:
+            if len(batch) == 1:
+                original_question, devices, _ = batch[0]
+                results = [await self._call_llm(original_question, devices)]
+            else:
+                results = await self._call_llm_batched(batch)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _call_llm(self, original_question: str, devices: list) -> tuple:
+        """Single-request LLM call (queue depth 1)."""
+        user_prompt = orjson.dumps({
+            "original_question": original_question,
+            "generic_devices": devices,
+        }, option=orjson.OPT_SORT_KEYS).decode()
+
+        response = await self.llm_client.call_json(
+            system_prompt=self.system_message,
+            messages=[{"role": "user", "content": user_prompt}],
+            model=self.model,
+        )
+        content = validate_output(GenericPrepOut, response.get("content"))
+        usage = {
+            "input_tokens": response.get("input_tokens", 0),
+            "output_tokens": response.get("output_tokens", 0),
         }
+        return content["devices"], usage
+
+    async def _call_llm_batched(self, batch: list) -> list:
+        """One LLM call for several requests, demultiplexed by batch_tag."""
+        questions = {}
+        tagged_devices = []
+        for i, (original_question, devices, _) in enumerate(batch):
+            tag = f"q{i}"
+            questions[tag] = original_question
+            tagged_devices.extend({**d, "batch_tag": tag} for d in devices)
+
+        logger.debug("[GenericPrep] Micro-batch: %d requests, %d devices", len(batch), len(tagged_devices))
+
+        user_prompt = orjson.dumps({
+            "original_question": questions,
+            "generic_devices": tagged_devices,
+        }, option=orjson.OPT_SORT_KEYS).decode()
+
+        response = await self.llm_client.call_json(
+            system_prompt=self.system_message + BATCH_PROMPT_ADDENDUM,
+            messages=[{"role": "user", "content": user_prompt}],
+            model=self.model,
+        )
+        content = validate_output(GenericPrepOut, response.get("content"))
+
+        by_tag = {f"q{i}": [] for i in range(len(batch))}
+        for d in content["devices"]:
+            tag = d.pop("batch_tag", None)
+            if tag in by_tag:
+                by_tag[tag].append(d)
+
+        # Split the shared call's cost evenly across callers; the first one
+        # also carries the remainder, so the shares add up to the call
+        n = len(batch)
+        input_tokens = response.get("input_tokens", 0)
+        output_tokens = response.get("output_tokens", 0)
+        results = [
+            (by_tag[f"q{i}"], {"input_tokens": input_tokens // n, "output_tokens": output_tokens // n})
+            for i in range(n)
+        ]
+        results[0][1]["input_tokens"] += input_tokens % n
+        results[0][1]["output_tokens"] += output_tokens % n
+
+        # A missing or mangled batch_tag drops that device from its caller:
+        # re-run callers whose count doesn't match alone
+        short = [i for i, (_, devices, _) in enumerate(batch) if len(by_tag[f"q{i}"]) != len(devices)]
+        if short:
+            logger.warning("[GenericPrep] Micro-batch item count mismatch for %d request(s), re-running alone", len(short))
+            reruns = await asyncio.gather(
+                *(self._call_llm(batch[i][0], batch[i][1]) for i in short),
+                return_exceptions=True,
+            )
+            for i, rerun in zip(short, reruns):
+                if isinstance(rerun, BaseException):
+                    # Keep the batch items; _resolve_with_llm flags the rest
+                    logger.warning("[GenericPrep] Re-run failed: %s", rerun)
+                    continue
+                devices, rerun_usage = rerun
+                usage = results[i][1]
+                usage["input_tokens"] += rerun_usage["input_tokens"]
+                usage["output_tokens"] += rerun_usage["output_tokens"]
+                results[i] = (devices, usage)
+        return results
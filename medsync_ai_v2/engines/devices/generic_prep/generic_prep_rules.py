@@ -0,0 +1,237 @@
+"""
+Generic Prep - Deterministic Rules
+
+Pure Python port of the GenericPrep decision tables in
+references/field_mapping.md and references/resolution_rules.md.
+
+resolve_generic_device() returns the same per-device dict the LLM produces,
+or None when the device is ambiguous (unknown device_type, unknown units,
+unlocatable context) and must be resolved by the LLM instead.
+"""
+
+import re
+
+
+# Input unit -> DATABASE field suffix (diameters)
+UNIT_SUFFIX = {"in": "_in", "mm": "_mm", "Fr": "_F", "F": "_F"}
+
+# Input unit -> multiplier to centimeters (length is always stored in cm)
+LENGTH_CONV = {"cm": 1.0, "mm": 0.1, "m": 100.0, "in": 2.54}
+
+# device_type -> logic_category
+LOGIC_CATEGORIES = {"wire", "catheter", "sheath", "stent", "balloon"}
+
+OD_FIELD = "specification_outer-diameter-{position}{suffix}"
+ID_FIELD = "specification_inner-diameter{suffix}"
+LENGTH_FIELD = "specification_length_cm"
+
+# Extraction attributes that carry a {"value", "unit"} dimension
+_DIMENSION_KEYS = ("OD", "ID", "size", "length")
+
+# Insufficient-info reasons, prebuilt per device_type (the only interpolation)
+REASON_NO_ATTRS = {dt: f"For a {dt}, we need dimensions (OD, ID) and length." for dt in LOGIC_CATEGORIES}
+REASON_NO_LENGTH = {dt: f"For a {dt}, we also need the length." for dt in LOGIC_CATEGORIES}
+REASON_NO_DIAMETER = {dt: f"For a {dt}, we need a dimension (OD or ID)." for dt in LOGIC_CATEGORIES}
+REASON_NEED_OD_AND_ID = {dt: f"For a {dt}, we need both the OD and ID." for dt in LOGIC_CATEGORIES}
+REASON_WIRE_NO_OD = "For a wire, we need the outer diameter."
+
+_DISTAL_RE = re.compile(r"\bdistal\b", re.IGNORECASE)
+_PROXIMAL_RE = re.compile(r"\bproximal\b", re.IGNORECASE)
+
+# Device before the keyword goes INTO the device after it
+_INTO_RE = re.compile(
+    r"\b(?:fits?|fitting|insert|go|goes)\s+(?:into|inside|in)\b|\binside\s+of\b|\bwithin\b|\bthrough\b",
+    re.IGNORECASE,
+)
+# Device before the keyword RECEIVES the device after it
+_ACCEPTS_RE = re.compile(r"\baccepts?\b|\bcan\s+accommodate\b", re.IGNORECASE)
+# No clear direction ("works with", "can I use X with Y", "compatible",
+# sequence questions): left to the LLM
+_AMBIGUOUS_RE = re.compile(
+    r"\bwith\b|\bcompatib\w*|\btogether\b|\bcombin\w*|\bsequence\b|\border\b",
+    re.IGNORECASE,
+)
+
+
+def _insufficient(device: dict, reason: str) -> dict:
+    return {
+        "raw": device.get("raw", ""),
+        "has_info": False,
+        "device_type": device.get("device_type"),
+        "reason": reason,
+    }
+
+
+def _sufficient(device: dict, search_criteria: dict) -> dict:
+    return {
+        "raw": device.get("raw", ""),
+        "has_info": True,
+        "device_type": device.get("device_type"),
+        "search_criteria": search_criteria,
+    }
+
+
+def _number(attr: dict):
+    value = attr.get("value")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _od_positions(raw: str) -> list:
+    """distal/proximal keyword in raw → that field only, else both."""
+    distal = bool(_DISTAL_RE.search(raw))
+    proximal = bool(_PROXIMAL_RE.search(raw))
+    if distal and not proximal:
+        return ["distal"]
+    if proximal and not distal:
+        return ["proximal"]
+    return ["distal", "proximal"]
+
+
+def _set_od(criteria: dict, attr: dict, raw: str) -> bool:
+    suffix = UNIT_SUFFIX.get(attr.get("unit"))
+    value = _number(attr)
+    if suffix is None or value is None:
+        return False
+    for position in _od_positions(raw):
+        criteria[OD_FIELD.format(position=position, suffix=suffix)] = value
+    return True
+
+
+def _set_id(criteria: dict, attr: dict) -> bool:
+    suffix = UNIT_SUFFIX.get(attr.get("unit"))
+    value = _number(attr)
+    if suffix is None or value is None:
+        return False
+    criteria[ID_FIELD.format(suffix=suffix)] = value
+    return True
+
+
+def _set_length(criteria: dict, attr: dict) -> bool:
+    factor = LENGTH_CONV.get(attr.get("unit"))
+    value = _number(attr)
+    if factor is None or value is None:
+        return False
+    criteria[LENGTH_FIELD] = round(value * factor, 4)
+    return True
+
+
+def _anchor(device: dict, question: str):
+    """
+    Position of the device in the question: its raw text, else its
+    device_type as a whole word ("catheter" does not match "microcatheter").
+    None when neither occurs exactly once.
+    """
+    for text, pattern in (
+        (device.get("raw", ""), r"\b{}\b"),
+        (device.get("device_type", ""), r"\b{}s?\b"),
+    ):
+        if not text:
+            continue
+        matches = list(re.finditer(pattern.format(re.escape(text)), question, re.IGNORECASE))
+        if len(matches) == 1:
+            return matches[0].start()
+        if matches:
+            return None
+    return None
+
+
+def _diameter_role(device: dict, original_question: str):
+    """
+    Decide which diameter a single dimension represents from question context.
+
+    Returns "OD", "ID", "both" (no relation stated at all), or None when the
+    LLM must decide: ambiguous phrasing ("with", "compatible", sequence
+    questions), more than one relation keyword, or a device that cannot be
+    located in the question unambiguously.
+    """
+    if _AMBIGUOUS_RE.search(original_question):
+        return None
+    anchor = _anchor(device, original_question)
+    if anchor is None:
+        return None
+
+    relations = [("into", m) for m in _INTO_RE.finditer(original_question)]
+    relations += [("accepts", m) for m in _ACCEPTS_RE.finditer(original_question)]
+    if not relations:
+        return "both"
+    if len(relations) > 1:
+        return None
+
+    kind, keyword = relations[0]
+    before = anchor < keyword.start()
+    if kind == "into":
+        return "OD" if before else "ID"
+    return "ID" if before else "OD"
+
+
+def resolve_generic_device(device: dict, original_question: str):
+    """
+    Resolve one structured generic device into GenericPrep output.
+
+    Returns:
+        dict in the GenericPrep device schema, or None if the LLM is needed.
+    """
+    device_type = device.get("device_type")
+    if device_type not in LOGIC_CATEGORIES:
+        return None
+
+    raw = device.get("raw", "") or ""
+    attrs = device.get("attributes") or {}
+    criteria = {"logic_category": device_type}
+
+    if not attrs:
+        return _insufficient(device, REASON_NO_ATTRS[device_type])
+
+    # Dimensions must be {"value", "unit"} dicts; anything else ("size": None,
+    # a bare number) is left to the LLM path
+    if not isinstance(attrs, dict) or any(
+        not isinstance(attrs[k], dict) for k in _DIMENSION_KEYS if k in attrs
+    ):
+        return None
+
+    if "length" in attrs and not _set_length(criteria, attrs["length"]):
+        return None
+
+    # ── Wires: OD only (size in inches counts as OD), length optional ──
+    if device_type == "wire":
+        od = attrs.get("OD")
+        if od is None and attrs.get("size", {}).get("unit") == "in":
+            od = attrs["size"]
+        if od is None:
+            if "size" in attrs:
+                return None
+            return _insufficient(device, REASON_WIRE_NO_OD)
+        if not _set_od(criteria, od, raw):
+            return None
+        return _sufficient(device, criteria)
+
+    # ── Non-wire devices: length required, diameters by context ──
+    if "length" not in attrs:
+        return _insufficient(device, REASON_NO_LENGTH[device_type])
+
+    diameters = [k for k in ("OD", "ID", "size") if k in attrs]
+    if not diameters:
+        return _insufficient(device, REASON_NO_DIAMETER[device_type])
+
+    if "OD" in attrs and "ID" in attrs:
+        if not (_set_od(criteria, attrs["OD"], raw) and _set_id(criteria, attrs["ID"])):
+            return None
+        return _sufficient(device, criteria)
+
+    if len(diameters) > 1:
+        return None
+
+    provided = diameters[0]
+    role = _diameter_role(device, original_question)
+    if role is None:
+        return None
+    if role == "both" or (provided != "size" and provided != role):
+        return _insufficient(device, REASON_NEED_OD_AND_ID[device_type])
+
+    attr = attrs[provided]
+    ok = _set_od(criteria, attr, raw) if role == "OD" else _set_id(criteria, attr)
+    if not ok:
+        return None
+    return _sufficient(device, criteria)
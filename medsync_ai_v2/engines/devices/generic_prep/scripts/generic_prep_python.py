@@ -8,9 +8,10 @@ the in-memory DATABASE so the chain engine can evaluate compatibility.
 Ported from vs2/agents/equipment_chain_agents.py GenericPrepPythonAgent.
 """
 
-import json
+import logging
 from medsync_ai_v2.base_agent import BaseAgent
-from medsync_ai_v2.shared.device_search import get_database
+
+logger = logging.getLogger(__name__)
 
 
 # All standard fields a DATABASE record can have
@@ -50,6 +51,18 @@ STANDARD_FIELDS = [
     "file_path_source_FDA_has_doc",
 ]
 
+# Fields whose defaults depend on the device / session (filled per record)
+_DYNAMIC_FIELDS = {"id", "product_name", "device_name", "logic_category"}
+
+# Static defaults for every other standard field, built once at import
+_DEFAULT_TEMPLATE = {f: "" for f in STANDARD_FIELDS if f not in _DYNAMIC_FIELDS}
+_DEFAULT_TEMPLATE.update({
+    "file_path_source_has_doc": False,
+    "Specifications_Pic_has_pic": False,
+    "file_path_source_FDA_has_doc": False,
+    "fit_logic": "math",
+})
+
 
 class GenericPrepPython(BaseAgent):
     """Creates synthetic DATABASE records for generic devices and injects them."""
@@ -74,51 +87,49 @@ class GenericPrepPython(BaseAgent):
                 "usage": {"input_tokens": 0, "output_tokens": 0}
             }
         """
-        devices = input_data.get("devices", [])
+        devices = [d for d in input_data.get("devices", []) if d.get("has_info", False)]
+        if not devices:
+            # Nothing to inject — don't touch (or load) the database
+            return {
+                "content": {"synthetic_devices": {}, "injected_count": 0},
+                "usage": {"input_tokens": 0, "output_tokens": 0},
+            }
+
         uid = input_data.get("uid", "0000")
         session_id = input_data.get("session_id", "0000")
 
-        print(f"  [GenericPrepPython] Processing {len(devices)} device(s)")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        lines = [f"[GenericPrepPython] Processing {len(devices)} device(s)"] if debug else None
 
         database = input_data.get("database")
         if database is None:
+            # Lazy import: device_search pulls in firebase_admin and whoosh
+            from medsync_ai_v2.shared.device_search import get_database
             database = get_database()
         synthetic_devices = {}
 
         for device in devices:
-            if not device.get("has_info", False):
-                continue
-
-            search_criteria = dict(device.get("search_criteria", {}))
-
-            # Fill in all standard fields with defaults
-            for field in STANDARD_FIELDS:
-                if field not in search_criteria:
-                    if field == "id":
-                        search_criteria[field] = uid[:4] + session_id[:4]
-                    elif field == "product_name":
-                        search_criteria[field] = device.get("device_type", "")
-                    elif field == "device_name":
-                        search_criteria[field] = device.get("raw", "")
-                    elif field == "file_path_source_has_doc":
-                        search_criteria[field] = False
-                    elif field == "Specifications_Pic_has_pic":
-                        search_criteria[field] = False
-                    elif field == "file_path_source_FDA_has_doc":
-                        search_criteria[field] = False
-                    elif field == "fit_logic":
-                        search_criteria[field] = "math"
-                    elif field == "logic_category":
-                        search_criteria[field] = device.get("device_type", "")
-                    else:
-                        search_criteria[field] = ""
-
-            record_id = search_criteria["id"]
-            database[record_id] = search_criteria
-            synthetic_devices[record_id] = search_criteria
-
-            print(f"  [GenericPrepPython] Injected synthetic record: id={record_id}, "
-                  f"device={search_criteria.get('device_name', '?')}")
+            record = {**_DEFAULT_TEMPLATE, **device.get("search_criteria", {})}
+
+            # Fill in the device/session-dependent defaults
+            device_type = device.get("device_type", "")
+            record.setdefault("id", uid[:4] + session_id[:4])
+            record.setdefault("product_name", device_type)
+            record.setdefault("device_name", device.get("raw", ""))
+            record.setdefault("logic_category", device_type)
+
+            # The database owns the injected record (the chain engine reads it);
+            # callers get their own copy so later edits can't leak between them.
+            record_id = record["id"]
+            database[record_id] = record
+            synthetic_devices[record_id] = record.copy()
+
+            if debug:
+                lines.append(f"  Injected synthetic record: id={record_id}, "
+                             f"device={record.get('device_name', '?')}")
+
+        if debug:
+            logger.debug("\n".join(lines))
 
         return {
             "content": {
@@ -3,10 +3,17 @@ Intent Classifier Agent
 
 Classifies equipment domain queries into specific intent types
 for routing to the correct engine.
+
+When LOCAL_INTENT_CLASSIFIER is set, a local embedding classifier
+(intent_classifier_model) answers confident single-intent queries; the LLM
+handles everything else.
 """
 
 import os
+import asyncio
+from medsync_ai_v2 import config
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.shared.agent_schemas import IntentOut, validate_output
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
 REFS_DIR = os.path.join(os.path.dirname(__file__), "references")
@@ -18,6 +25,7 @@ class IntentClassifier(LLMAgent):
     def __init__(self):
         super().__init__(name="intent_classifier", skill_path=SKILL_PATH)
         self._load_references()
+        self._local_model_available = config.LOCAL_INTENT_CLASSIFIER
 
     def _load_references(self):
         """Load intent types reference into system prompt."""
@@ -27,28 +35,57 @@ class IntentClassifier(LLMAgent):
                 refs = f.read()
             self.system_message += "\n\n## Reference: Intent Types & Rules\n\n" + refs
 
+    def _classify_locally(self, normalized_query: str):
+        """Embedding classifier; None when unsure or unavailable (use the LLM)."""
+        if not self._local_model_available:
+            return None
+        try:
+            # Lazy import: the embedding model module pulls in numpy
+            from medsync_ai_v2.engines.devices.intent_classifier.intent_classifier_model import get_intent_model
+            return get_intent_model().classify(normalized_query)
+        except Exception as e:
+            print(f"  [IntentClassifier] Local model unavailable, using LLM only: {e}")
+            self._local_model_available = False
+            return None
+
     async def run(self, input_data: dict, session_state: dict) -> dict:
         normalized_query = input_data.get("normalized_query", "")
         print(f"  [IntentClassifier] Classifying: {normalized_query[:150]}")
 
-        messages = [{"role": "user", "content": normalized_query}]
-        response = await self.llm_client.call_json(
-            system_prompt=self.system_message,
-            messages=messages,
-            model=self.model,
-        )
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        issues = []
+        local = await asyncio.to_thread(self._classify_locally, normalized_query)
 
-        content = response.get("content", {})
-        intents = content.get("intents", [])
+        if local is not None:
+            content = validate_output(IntentOut, local)
+        else:
+            messages = [{"role": "user", "content": normalized_query}]
+            response = await self.llm_client.call_json(
+                system_prompt=self.system_message,
+                messages=messages,
+                model=self.model,
+            )
+            raw = response.get("content")
+            if isinstance(raw, dict) and "raw_text" in raw:
+                issues.append("JSON parse failed")
+            content = validate_output(IntentOut, raw, issues)
+            usage = {
+                "input_tokens": response.get("input_tokens", 0),
+                "output_tokens": response.get("output_tokens", 0),
+            }
+
+        intents = content["intents"]
         primary = intents[0]["type"] if intents else "general"
         print(f"  [IntentClassifier] Primary intent: {primary}, "
-              f"multi={content.get('is_multi_intent', False)}, "
-              f"planning={content.get('needs_planning', False)}")
+              f"multi={content['is_multi_intent']}, "
+              f"planning={content['needs_planning']}, "
+              f"source={'local' if local is not None else 'llm'}")
 
-        return {
+        result = {
             "content": content,
-            "usage": {
-                "input_tokens": response.get("input_tokens", 0),
-                "output_tokens": response.get("output_tokens", 0),
-            },
+            "usage": usage,
         }
+        if issues:
+            # Repaired/defaulted output: usable for this turn, not worth caching
+            result["degraded"] = "; ".join(issues)
+        return result
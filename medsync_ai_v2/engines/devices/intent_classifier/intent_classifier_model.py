@@ -0,0 +1,112 @@
+"""
+Intent Classifier - Embedding Model
+
+Small local text classifier used before the LLM. Queries are embedded with
+all-MiniLM-L6-v2 and scored against per-intent centroids built from the
+labeled examples in references/intent_examples.json (a nearest-centroid
+linear head). Only confident single-intent predictions are returned; anything
+else falls back to the LLM classifier. Off unless LOCAL_INTENT_CLASSIFIER is
+set (config): the thresholds below are not yet measured on a held-out
+labeled set.
+
+Add examples to intent_examples.json (e.g. bootstrapped from LLM
+classifications in production logs) to widen coverage — no code changes needed.
+"""
+
+import os
+import re
+import json
+import threading
+
+import numpy as np
+
+from medsync_ai_v2.shared.embeddings import DEFAULT_EMBEDDING_MODEL, get_sentence_encoder
+
+EMBEDDING_MODEL = DEFAULT_EMBEDDING_MODEL
+EXAMPLES_PATH = os.path.join(os.path.dirname(__file__), "references", "intent_examples.json")
+
+# Minimum top-1 probability to skip the LLM
+CONFIDENCE_THRESHOLD = 0.8
+
+# Softmax is relative: an off-pattern query still gets a high probability for
+# whichever centroid is least far. Also require an absolute cosine to the
+# winning centroid and a cosine gap to the runner-up.
+MIN_SIMILARITY = 0.55
+MIN_MARGIN = 0.05
+
+# Softmax temperature over cosine similarities
+TEMPERATURE = 20.0
+
+# Intents that always need the planner (see Planning Rules in intent_types.md)
+PLANNING_INTENTS = {"filtered_discovery"}
+
+# Multi-part questions need the LLM to detect multiple intents
+_MULTI_PART_RE = re.compile(r"\?.*\?|\b(?:and|also|plus)\s+(?:what|which|how|does|is|can|show)\b", re.IGNORECASE)
+
+
+class IntentEmbeddingModel:
+    """Nearest-centroid intent classifier over sentence embeddings."""
+
+    def __init__(self, examples_path: str = EXAMPLES_PATH, model_name: str = EMBEDDING_MODEL):
+        with open(examples_path, "r", encoding="utf-8") as f:
+            examples = json.load(f)
+
+        self.encoder = get_sentence_encoder(model_name)
+        self.labels = list(examples.keys())
+
+        centroids = []
+        for label in self.labels:
+            vectors = self.encoder.encode(examples[label], normalize_embeddings=True)
+            centroid = vectors.mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        self.centroids = np.vstack(centroids)
+
+    def predict(self, query: str):
+        """
+        Returns:
+            (label, probability, cosine, margin) for the top intent, or None
+            for multi-part queries. margin is the cosine gap to the runner-up.
+        """
+        if not query or _MULTI_PART_RE.search(query):
+            return None
+        vector = self.encoder.encode([query], normalize_embeddings=True)[0]
+        sims = self.centroids @ vector
+        logits = TEMPERATURE * sims
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        order = np.argsort(sims)[::-1]
+        best = int(order[0])
+        margin = float(sims[best] - sims[order[1]]) if len(order) > 1 else float(sims[best])
+        return self.labels[best], float(probs[best]), float(sims[best]), margin
+
+    def classify(self, query: str):
+        """
+        Returns:
+            IntentClassifier output dict if confident, else None (use the LLM).
+        """
+        prediction = self.predict(query)
+        if prediction is None:
+            return None
+        label, prob, similarity, margin = prediction
+        if prob < CONFIDENCE_THRESHOLD or similarity < MIN_SIMILARITY or margin < MIN_MARGIN:
+            return None
+        return {
+            "intents": [{"type": label, "confidence": round(prob, 3)}],
+            "is_multi_intent": False,
+            "needs_planning": label in PLANNING_INTENTS,
+            "rationale": f"embedding classifier (p={prob:.2f}, cos={similarity:.2f}, margin={margin:.2f})",
+        }
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_intent_model():
+    """Load the embedding model once (thread-safe; call via asyncio.to_thread)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = IntentEmbeddingModel()
+    return _model
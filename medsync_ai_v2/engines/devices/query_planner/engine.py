@@ -10,12 +10,24 @@ and this agent is never called.
 """
 
 import os
-import json
+import re
+import logging
+import orjson
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.engines.devices.database_engine.query_executor import CATEGORY_MAP
+
+logger = logging.getLogger(__name__)
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
 REFERENCES_DIR = os.path.join(os.path.dirname(__file__), "references")
 
+# Document-side asks (IFU / 510(k) / labeling) need the LLM to plan a vector step
+_DOCS_HINT_RE = re.compile(
+    r"\b(?:ifu|510\s*\(?k\)?|instructions?|indications?|contraindications?|warnings?|"
+    r"deploy\w*|labell?ing|documents?|fda|clearance)\b",
+    re.IGNORECASE,
+)
+
 
 class QueryPlanner(LLMAgent):
     """Lightweight planner that generates multi-engine execution plans."""
@@ -32,6 +44,42 @@ class QueryPlanner(LLMAgent):
                 with open(ref_path, "r", encoding="utf-8") as f:
                     self.system_message += "\n\n" + f.read()
 
+    def _rule_based_plan(self, input_data: dict) -> dict | None:
+        """
+        The filter_only plan for "<manufacturer> <category>" listings (e.g. "Show
+        me all Stryker stent retrievers"): no named devices, one known category,
+        a single manufacturer constraint, nothing generic or document-related.
+        Returns None when the query needs the LLM planner.
+        """
+        categories = input_data.get("categories", [])
+        constraints = input_data.get("constraints", [])
+        if input_data.get("devices") or input_data.get("generic_specs"):
+            return None
+        if len(categories) != 1 or len(constraints) != 1:
+            return None
+        constraint = constraints[0]
+        if constraint.get("field") != "manufacturer" or not constraint.get("value"):
+            return None
+        category = categories[0].strip().lower().replace(" ", "_")
+        if category not in CATEGORY_MAP:
+            return None
+        if _DOCS_HINT_RE.search(input_data.get("normalized_query", "")):
+            return None
+
+        return {
+            "strategy": "filter_only",
+            "steps": [{
+                "step_id": "s1",
+                "engine": "database",
+                "action": "filter_by_spec",
+                "category": category,
+                "filters": [{"field": "manufacturer", "operator": "contains", "value": constraint["value"]}],
+                "store_as": "filtered_devices",
+                "depends_on": [],
+            }],
+            "output_agent": "database_output_agent",
+        }
+
     async def run(self, input_data: dict, session_state: dict) -> dict:
         """
         Generate an execution plan based on extraction output.
@@ -42,27 +90,33 @@ class QueryPlanner(LLMAgent):
         Returns:
             {"content": <plan dict>, "usage": {...}}
         """
+        plan = self._rule_based_plan(input_data)
+        if plan is not None:
+            logger.info("[QueryPlanner] Rule-based filter_only plan (no LLM call)")
+            return {"content": plan, "usage": {"input_tokens": 0, "output_tokens": 0}}
+
         normalized_query = input_data.get("normalized_query", "")
         devices = input_data.get("devices", {})
         categories = input_data.get("categories", [])
         constraints = input_data.get("constraints", [])
 
         # Build context for the planner
-        device_info = []
-        for name, info in devices.items():
-            device_info.append(f'  "{name}": conical_category={info.get("conical_category", "?")}')
+        device_info = [
+            f'  "{name}": conical_category={info.get("conical_category", "?")}'
+            for name, info in devices.items()
+        ]
 
         user_prompt = f"""User Question: {normalized_query}
 
 Devices found: {', '.join(devices.keys()) if devices else 'none'}
 {chr(10).join(device_info) if device_info else ''}
 Categories mentioned: {', '.join(categories) if categories else 'none'}
-Constraints: {json.dumps(constraints)}
+Constraints: {orjson.dumps(constraints, default=str).decode()}
 
 Generate an execution plan. Respond with ONLY valid JSON."""
 
-        print(f"  [QueryPlanner] Planning for: {normalized_query[:150]}")
-        print(f"  [QueryPlanner] Constraints: {constraints}")
+        logger.debug("[QueryPlanner] Planning for: %s", normalized_query[:150])
+        logger.debug("[QueryPlanner] Constraints: %s", constraints)
 
         messages = [{"role": "user", "content": user_prompt}]
         response = await self.llm_client.call_json(
@@ -74,7 +128,7 @@ Generate an execution plan. Respond with ONLY valid JSON."""
         plan = response.get("content", {})
         strategy = plan.get("strategy", "unknown")
         steps = plan.get("steps", [])
-        print(f"  [QueryPlanner] Strategy: {strategy}, {len(steps)} steps")
+        logger.info("[QueryPlanner] Strategy: %s, %s steps", strategy, len(steps))
 
         return {
             "content": plan,
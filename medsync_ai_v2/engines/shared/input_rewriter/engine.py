@@ -2,31 +2,102 @@
 Input Rewriter Agent
 
 Normalizes user queries, preserves sentiment, resolves follow-ups.
+Standalone first-turn queries skip the LLM entirely (nothing to resolve);
+paraphrases of recent queries in the same context are served from a semantic
+cache (rewriter_cache).
 """
 
 import os
+import re
+import asyncio
 from medsync_ai_v2.base_agent import LLMAgent
+from medsync_ai_v2.shared.agent_schemas import RewriterOut, validate_output
+from medsync_ai_v2.shared.session_state import has_prior_turns
 
 SKILL_PATH = os.path.join(os.path.dirname(__file__), "SKILL.md")
 
+# Pronouns / follow-up markers that need conversation context to resolve
+_FOLLOWUP_RE = re.compile(
+    r"\b(it|they|them|that|this|those|what about|instead|without|add|same|previous|earlier)\b",
+    re.IGNORECASE,
+)
+
+# Explicit source mentions (mirrors the source_filter rule in SKILL.md)
+_SOURCE_RE = re.compile(r"\b(IFU|510[kK]|FDA|website|datasheet)\b")
+
+# Tokens containing digits: sizes, lengths, model numbers ("71", "0.021", "6f", "5mm")
+_SPEC_TOKEN_RE = re.compile(r"[a-z]*\d+(?:\.\d+)*[a-z\d]*")
+
+
+def _spec_id(raw_query: str) -> int:
+    """Semantic-cache spec id: hash of the query's digit-bearing tokens (order-insensitive)."""
+    return hash(frozenset(_SPEC_TOKEN_RE.findall(raw_query.lower())))
+
 
 class InputRewriter(LLMAgent):
     """Normalizes user queries and resolves follow-ups."""
 
     def __init__(self):
         super().__init__(name="input_rewriter", skill_path=SKILL_PATH)
+        self._semantic_cache_available = True
 
-    async def run(self, input_data: dict, session_state: dict) -> dict:
-        # Build messages with conversation history for follow-up resolution
-        messages = []
-        for msg in session_state.get("conversation_history", [])[-6:]:
-            if msg.get("role") in ("user", "assistant"):
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"],
-                })
+    def _semantic_lookup(self, raw_query: str, context_id: int, spec: int) -> tuple:
+        """(embedding, cached hit or None); (None, None) when the cache is unavailable."""
+        if not self._semantic_cache_available:
+            return None, None
+        try:
+            # Lazy import: pulls in numpy / sentence_transformers
+            from medsync_ai_v2.engines.shared.input_rewriter.rewriter_cache import get_rewriter_cache
+            cache = get_rewriter_cache()
+            vector = cache.embed(raw_query)
+            return vector, cache.lookup(vector, context_id, spec)
+        except Exception as e:
+            print(f"  [InputRewriter] Semantic cache unavailable: {e}")
+            self._semantic_cache_available = False
+            return None, None
 
+    async def run(self, input_data: dict, session_state: dict) -> dict:
         raw_query = input_data.get("raw_query", input_data.get("query", ""))
+        history = session_state.get("conversation_history", [])
+
+        # Short-circuit: no prior turns and no follow-up markers → nothing to rewrite
+        if not has_prior_turns(history, raw_query) and not _FOLLOWUP_RE.search(raw_query):
+            print(f"  [InputRewriter] Standalone query, skipping LLM")
+            return {
+                "content": {
+                    "rewritten_user_prompt": raw_query,
+                    "source_filter": _SOURCE_RE.findall(raw_query),
+                },
+                "usage": {"input_tokens": 0, "output_tokens": 0},
+            }
+
+        # Build messages with conversation history for follow-up resolution.
+        # recent_turns is maintained at write time (session_state.append_turn);
+        # sessions saved before it existed fall back to slicing the history.
+        recent_turns = session_state.get("recent_turns")
+        if recent_turns is not None:
+            messages = list(recent_turns)
+        else:
+            messages = [
+                {"role": msg["role"], "content": msg["content"]}
+                for msg in history[-6:]
+                if msg.get("role") in ("user", "assistant")
+            ]
+
+        if messages and messages[-1]["role"] == "user" and messages[-1]["content"] == raw_query:
+            messages.pop()
+        context_id = hash(tuple((m["role"], m["content"]) for m in messages))
+        spec = _spec_id(raw_query)
+
+        vector, hit = await asyncio.to_thread(self._semantic_lookup, raw_query, context_id, spec)
+        if hit is not None:
+            content, similarity = hit
+            print(f"  [InputRewriter] Semantic cache hit (sim={similarity:.3f}), skipping LLM")
+            return {
+                "content": content,
+                "usage": {"input_tokens": 0, "output_tokens": 0},
+            }
+
         messages.append({"role": "user", "content": raw_query})
 
         response = await self.llm_client.call_json(
@@ -35,7 +106,11 @@ class InputRewriter(LLMAgent):
             model=self.model,
         )
 
-        content = response.get("content", {})
+        content = validate_output(RewriterOut, response.get("content"))
+        content.setdefault("rewritten_user_prompt", raw_query)
+        if vector is not None:
+            from medsync_ai_v2.engines.shared.input_rewriter.rewriter_cache import get_rewriter_cache
+            get_rewriter_cache().insert(vector, context_id, spec, content)
         return {
             "content": content,
             "usage": {
@@ -0,0 +1,94 @@
+"""
+Input Rewriter - Semantic Cache
+
+Maps recent raw queries to their rewriter output by embedding similarity, so
+paraphrases of a query rewritten a moment ago ("what cable fits X" / "which
+cable works with X") reuse it instead of another LLM call.
+
+Rewrites depend on conversation context, so every entry carries a context id
+(hash of the prior turns) and only entries with the same context can match;
+first-turn queries share the empty context across sessions. Sizes and model
+numbers barely move the embedding ("Vecta 71" / "Vecta 74"), so entries also
+carry a spec id (hash of the query's tokens containing digits) that must
+match exactly.
+
+Entries live in a fixed-size ring buffer of normalized embeddings; lookup is
+a single matrix-vector product (brute-force cosine), which at this size is
+faster than maintaining an ANN index with TTL deletes.
+"""
+
+import time
+import threading
+
+import numpy as np
+
+from medsync_ai_v2.shared.embeddings import embed
+
+# Cosine similarity required to reuse a cached rewrite
+SIMILARITY_THRESHOLD = 0.97
+
+REWRITER_CACHE_SIZE = 4096
+REWRITER_CACHE_TTL_S = 3600
+
+
+class RewriterCache:
+    """Ring buffer of (embedding -> rewriter content) with TTL expiry."""
+
+    def __init__(self, size: int = REWRITER_CACHE_SIZE, ttl: float = REWRITER_CACHE_TTL_S):
+        self.size = size
+        self.ttl = ttl
+        self._vectors = None
+        self._expires = np.zeros(size)
+        self._context_ids = np.zeros(size, dtype=np.int64)
+        self._spec_ids = np.zeros(size, dtype=np.int64)
+        self._contents = [None] * size
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def embed(self, raw_query: str):
+        return embed([raw_query])[0]
+
+    def lookup(self, vector, context_id: int, spec: int):
+        """
+        Returns:
+            (cached content, similarity) for the nearest live entry with the
+            same context_id and spec id above SIMILARITY_THRESHOLD, or None.
+        """
+        with self._lock:
+            if self._vectors is None:
+                return None
+            scores = self._vectors @ vector
+            scores[
+                (self._expires < time.monotonic())
+                | (self._context_ids != context_id)
+                | (self._spec_ids != spec)
+            ] = -1.0
+            best = int(scores.argmax())
+            if scores[best] < SIMILARITY_THRESHOLD:
+                return None
+            return dict(self._contents[best]), float(scores[best])
+
+    def insert(self, vector, context_id: int, spec: int, content: dict):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.size, vector.shape[0]), dtype=vector.dtype)
+            slot = self._next
+            self._vectors[slot] = vector
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._context_ids[slot] = context_id
+            self._spec_ids[slot] = spec
+            self._contents[slot] = dict(content)
+            self._next = (slot + 1) % self.size
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_rewriter_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RewriterCache()
+    return _cache
@@ -8,16 +8,20 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
-import json
 import asyncio
 from datetime import datetime, timezone
 
+import orjson
+
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from medsync_ai_v2.shared.session_state import SessionManager
+from medsync_ai_v2.shared.session_state import SessionManager, append_turn
 from medsync_ai_v2.shared.device_search import get_database, get_text_search, build_whoosh_index, FirebaseDB
+from medsync_ai_v2.shared.llm_client import close_http_client
+from medsync_ai_v2.shared.vector_client import close_session
+from medsync_ai_v2.shared.log_setup import configure_logging, stop_logging
 from medsync_ai_v2.orchestrator.orchestrator import Orchestrator
 from medsync_ai_v2.engines.clinical.ais_clinical_engine.routes import router as clinical_router
 from medsync_ai_v2.engines.sales.sales_training_engine.routes import router as sales_router
@@ -26,6 +30,8 @@ from medsync_ai_v2 import config
 
 # ── App Setup ─────────────────────────────────────────────────
 
+configure_logging()
+
 app = FastAPI(title="MedSync AI v2")
 app.add_middleware(
     CORSMiddleware,
@@ -73,10 +79,32 @@ async def startup_load_database():
     print("Startup complete — database and search index ready.")
 
 
+@app.on_event("startup")
+async def startup_warm_orchestrator():
+    """Build the orchestrator tool registry so the first request doesn't pay for it."""
+    await orchestrator.warmup()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Close the shared LLM and vector store connection pools."""
+    await close_http_client()
+    close_session()
+
+
+@app.on_event("shutdown")
+async def shutdown_logging():
+    """Flush queued log records."""
+    stop_logging()
+
+
 # ── Streaming Broker ──────────────────────────────────────────
 
 class StreamingBroker:
-    """Async queue-based SSE broker."""
+    """
+    Async queue-based SSE broker. The queue is unbounded, so put() never
+    waits on the SSE client: a slow reader cannot stall the pipeline.
+    """
 
     def __init__(self):
         self._q = asyncio.Queue()
@@ -119,7 +147,7 @@ async def run_orchestrator_with_broker(
         )
 
         # Append assistant response to conversation history
-        session_state["conversation_history"].append({
+        append_turn(session_state, {
             "role": "assistant",
             "content": final_text,
             "type": "final_answer",
@@ -230,7 +258,7 @@ async def chat_stream(request: Request):
 
     # Append user message
     session_state["last_user_input"] = message
-    session_state["conversation_history"].append({
+    append_turn(session_state, {
         "role": "user",
         "content": message,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -248,7 +276,7 @@ async def chat_stream(request: Request):
                 event.setdefault("data", {})
                 event["data"]["uid"] = uid
                 event["data"]["session_id"] = session_id
-                yield "data: " + json.dumps(event, default=str) + "\n\n"
+                yield "data: " + orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS).decode() + "\n\n"
         finally:
             await broker.close()
 
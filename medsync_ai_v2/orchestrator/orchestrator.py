@@ -14,18 +14,38 @@ Emits per-agent status events through the StreamingBroker.
 """
 
 import asyncio
+import copy
 import json
+import logging
 import os
+import re
 import time
+from collections import deque
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+import orjson
 from medsync_ai_v2 import config
+from medsync_ai_v2.shared.breaker import CircuitBreaker
+from medsync_ai_v2.shared.coalescer import coalesce
+from medsync_ai_v2.shared.device_search import get_catalog_epoch
+from medsync_ai_v2.orchestrator.response_cache import (
+    AGENT_CACHE_TTL_S, ENGINE_CACHE_MAXSIZE, ENGINE_CACHE_TTL_S,
+    AgentResultCache, ResponseCache, RecordingBroker, cache_key, context_snapshot,
+)
+from medsync_ai_v2.shared.session_state import has_prior_turns
+
+logger = logging.getLogger(__name__)
 
 # Lazy imports for tool executors (avoid circular imports)
 _tool_registry = None
 
 
 def _get_tool_registry():
-    """Lazy-load all tool executors."""
+    """
+    Lazy-load all tool executors. Built once per process (warmup) into a
+    plain dict of agent instances, so registry[...] lookups are cheap.
+    """
     global _tool_registry
     if _tool_registry is not None:
         return _tool_registry
@@ -80,6 +100,233 @@ def _get_tool_registry():
     return _tool_registry
 
 
+@lru_cache(maxsize=1)
+def _device_search_helper():
+    from medsync_ai_v2.shared.device_search import DeviceSearchHelper
+    return DeviceSearchHelper()
+
+
+@lru_cache(maxsize=4096)
+def _close_matches(name_lower: str, max_suggestions: int, catalog_epoch: int) -> tuple:
+    """
+    Fuzzy suggestions for an unresolved device name, memoized per device
+    catalog epoch (matching is case-insensitive, so callers key on the
+    lowercased name). Thread-safe: called from worker threads.
+    """
+    return tuple(_device_search_helper().suggest_close_matches(name_lower, max_suggestions=max_suggestions))
+
+
+# Steps 3+4 timeouts: fixed (env) or adaptive = multiplier x p95 of recent
+# completed model calls once enough samples exist (None = unbounded), never
+# below the floor
+SUB_AGENT_TIMEOUTS_MS = {
+    "intent_classifier": config.INTENT_TIMEOUT_MS,
+    "equipment_extraction": config.EXTRACT_TIMEOUT_MS,
+}
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 50
+ADAPTIVE_TIMEOUT_MULTIPLIER = 2.0
+ADAPTIVE_TIMEOUT_FLOOR_MS = 5000
+
+# Deterministic results used when a bounded sub-agent times out or its
+# circuit breaker is open
+SUB_AGENT_FALLBACKS = {
+    "intent_classifier": {
+        "intents": [{"type": "general", "confidence": 0.0}],
+        "is_multi_intent": False,
+        "needs_planning": False,
+        "rationale": "fallback: intent classifier timed out or unavailable",
+    },
+    "equipment_extraction": {
+        "devices": {},
+        "categories": [],
+        "generic_specs": [],
+        "not_found": [],
+    },
+}
+
+
+# Shared read-only defaults for missing extraction fields (avoids allocating
+# a fresh []/{} per .get() on every request)
+_EMPTY_LIST = ()
+_EMPTY_DICT = MappingProxyType({})
+
+# Maps intent types to engine paths
+INTENT_ENGINE_MAP = MappingProxyType({
+    "equipment_compatibility": "chain",
+    "device_discovery": "chain",
+    "specification_lookup": "database",
+    "spec_reasoning": "database",
+    "device_search": "database",
+    "device_comparison": "database",
+    "manufacturer_lookup": "database",
+    "filtered_discovery": "planned",
+    "documentation": "vector",
+    "knowledge_base": "vector",
+    "device_definition": "vector",
+    "clinical_support": "clinical",
+    "deep_research": "research",
+    "general": "general",
+})
+
+# Intents that require synthetic devices from the generic pipeline
+COMPAT_INTENTS = frozenset({
+    "equipment_compatibility",
+    "device_discovery",
+    "filtered_discovery",
+})
+
+# Intents where ALL named devices must be resolved (partial results are misleading)
+RELATIONAL_INTENTS = frozenset({
+    "equipment_compatibility",
+    "device_discovery",
+    "device_comparison",
+    "filtered_discovery",
+})
+
+
+def _keyword_re(keywords) -> re.Pattern:
+    """Substring match for any of keywords (same semantics as any(kw in text))."""
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+
+# Clinical follow-up detection (_merge_clinical_followup); matched on the lowercased query
+_CLINICAL_KEYWORDS_RE = _keyword_re([
+    "nihss", "aspects", "aspect", "lkw", "last known well",
+    "mca", "occlusion", "lvo", "mrs", "hour", "hr",
+    "wake-up", "wake up", "cta", "perfusion",
+    "m1", "m2", "m3", "ica", "basilar", "vertebral", "pca",
+    "carotid",
+    # LKW time-of-day phrases (e.g. "last normal at 10pm, found at 6am")
+    "last normal", "found at", "went to bed", "woke up", "bedtime",
+    "normal at", "last seen normal", "last seen well",
+])
+_BARE_TIME_RE = re.compile(r'\b\d{1,2}(?:am|pm|:\d{2})\b')
+_UNAVAILABLE_RE = _keyword_re([
+    "don't have", "do not have", "not available", "unavailable",
+    "unknown", "can't provide", "cannot provide", "not done",
+    "no cta", "no imaging", "no aspects", "no perfusion",
+    "not performed", "wasn't done", "didn't do", "no access to",
+    # "I don't know" variants
+    "don't know", "do not know", "not sure", "unsure", "no idea",
+    "not known", "couldn't tell", "can't tell",
+])
+# Terse numeric answers, e.g. "15, 9, 3 hours"
+_NUMERIC_CLINICAL_RE = re.compile(r'\d+\s*[,;]\s*\d+')
+_AGE_RE = re.compile(r'\b(\d{1,3})\s*(?:years?\s*old|yo|y/o)\b', re.IGNORECASE)
+_AGE_COMPACT_RE = re.compile(r'\b(\d{1,3})[MF]\b')
+_PERFUSION_DONE_RE = _keyword_re(["ctp done", "perfusion done", "dwi-flair", "has ctp"])
+_PERFUSION_NOT_DONE_RE = _keyword_re(["no ctp", "no perfusion", "perfusion not done"])
+
+# Guideline follow-up detection (_enrich_guideline_query); lowercased query.
+# Must look like a guideline/evidence question...
+_GUIDELINE_INTENT_RE = _keyword_re([
+    "guideline", "evidence", "trial", "study", "data",
+    "cor ", "loe ", "class of recommendation", "level of evidence",
+    "what did", "what does", "what about", "tell me more",
+    "show me", "explain", "can you elaborate",
+    "subgroup", "analysis", "outcome", "result",
+    "hermes", "dawn", "defuse", "select2", "angel", "tension",
+    "trace", "timeless", "ninds", "ecass", "escape", "revascat",
+    "enchanted", "baoche", "attention", "basics",
+    "wake-up", "extend", "rescue",
+])
+# ...without patient parameters (a new presentation)...
+_GUIDELINE_PATIENT_RE = _keyword_re([
+    "nihss", "aspects", "lkw", "last known well",
+    "year-old", "yo ", "occlusion", "cta shows",
+])
+# ...or device intent (a device question)
+_GUIDELINE_DEVICE_RE = _keyword_re([
+    "device", "catheter", "microcatheter", "stent retriever",
+    "configuration", "compatible", "vecta", "headway", "solitaire",
+])
+
+# Patient summaries are built from (field, shown when, formatter) tables.
+# Scores and times show whenever parsed ("present": 0 is meaningful); free
+# text and flags only when "truthy". A "derived" entry has no single field:
+# its formatter picks from several and returns None to skip.
+def _patient_parts(patient: dict, fields: tuple) -> list:
+    """Format the fields of a patient dict that pass their shown-when test."""
+    if not patient:
+        return []  # no Turn-1 data (pure follow-up): nothing to walk
+    parts = []
+    for field, shown_when, fmt in fields:
+        if shown_when == "derived":
+            part = fmt(patient)
+            if part is not None:
+                parts.append(part)
+            continue
+        value = patient.get(field)
+        if (value if shown_when == "truthy" else value is not None):
+            parts.append(fmt(patient))
+    return parts
+
+
+_OCCLUSION_SEGMENT_LABELS = {
+    "M1": "M1",
+    "M2_dominant": "dominant M2",
+    "M2_nondominant": "nondominant M2",
+}
+
+
+def _occlusion_part(patient: dict) -> str | None:
+    if patient.get("occlusion_location"):
+        return f"{patient['occlusion_location']} occlusion"
+    segment = patient.get("occlusion_segment")
+    if segment and segment != "unspecified":
+        return f"{_OCCLUSION_SEGMENT_LABELS.get(segment, segment)} occlusion"
+    if patient.get("lvo"):
+        return "LVO confirmed"
+    return None
+
+
+def _onset_part(patient: dict) -> str | None:
+    if patient.get("wake_up_stroke"):
+        return "wake-up stroke"
+    if patient.get("unknown_onset"):
+        return "unknown onset"
+    return None
+
+
+# Clinical clarification: what was parsed, for the doctor to verify
+_CLINICAL_SUMMARY_FIELDS = (
+    ("age", "present", lambda p: f"{p['age']}{p['sex'][0].upper() if p.get('sex') else ''}"),  # "female" → "F"
+    ("nihss", "present", lambda p: f"NIHSS {p['nihss']}"),
+    ("aspects", "present", lambda p: f"ASPECTS {p['aspects']}"),
+    ("last_known_well_hours", "present", lambda p: f"LKW {p['last_known_well_hours']}h"),
+    ("occlusion_location", "truthy", lambda p: p["occlusion_location"]),
+    ("mrs_pre", "present", lambda p: f"mRS {p['mrs_pre']}"),
+    ("dementia", "truthy", lambda p: "dementia"),
+    ("on_anticoagulation", "truthy", lambda p: f"on {p.get('anticoagulant_type', 'anticoagulation')}"),
+)
+
+# Clinical follow-up merge: what Turn 1 already established
+_KNOWN_PATIENT_FIELDS = (
+    ("age", "truthy", lambda p: f"{p['age']}yo {p.get('sex', '')}".strip()),
+    (None, "derived", _occlusion_part),
+    (None, "derived", _onset_part),
+    ("last_known_well_hours", "present", lambda p: f"LKW {p['last_known_well_hours']}h"),
+    ("nihss", "present", lambda p: f"NIHSS {p['nihss']}"),
+    ("aspects", "present", lambda p: f"ASPECTS {p['aspects']}"),
+    ("mrs_pre", "present", lambda p: f"mRS {p['mrs_pre']}"),
+    ("on_anticoagulation", "truthy", lambda p: f"on {p.get('anticoagulant_type', 'anticoagulation')}"),
+    ("has_perfusion_imaging", "truthy", lambda p: "perfusion imaging available"),
+)
+
+# Eligibility statuses listed as "pathways flagged" in guideline enrichment
+_FLAGGED_ELIGIBILITY = frozenset({"UNCERTAIN", "CONDITIONAL"})
+
+# Guideline follow-up enrichment: context from the previous assessment
+_GUIDELINE_CONTEXT_FIELDS = (
+    ("mrs_pre", "present", lambda p: f"pre-stroke mRS {p['mrs_pre']}"),
+    ("last_known_well_hours", "present", lambda p: f"LKW {p['last_known_well_hours']}h"),
+    ("aspects", "present", lambda p: f"ASPECTS {p['aspects']}"),
+    ("occlusion_location", "truthy", lambda p: f"{p['occlusion_location']} occlusion"),
+    ("age", "truthy", lambda p: f"age {p['age']}"),
+)
+
+
 class Orchestrator:
     """
     Intent-based orchestrator pipeline.
@@ -88,41 +335,25 @@ class Orchestrator:
     Routing is based on classified user intent, not extraction output shape.
     """
 
-    # Maps intent types to engine paths
-    INTENT_ENGINE_MAP = {
-        "equipment_compatibility": "chain",
-        "device_discovery": "chain",
-        "specification_lookup": "database",
-        "spec_reasoning": "database",
-        "device_search": "database",
-        "device_comparison": "database",
-        "manufacturer_lookup": "database",
-        "filtered_discovery": "planned",
-        "documentation": "vector",
-        "knowledge_base": "vector",
-        "device_definition": "vector",
-        "clinical_support": "clinical",
-        "deep_research": "research",
-        "general": "general",
-    }
-
-    # Intents that require synthetic devices from the generic pipeline
-    COMPAT_INTENTS = {
-        "equipment_compatibility",
-        "device_discovery",
-        "filtered_discovery",
-    }
-
-    # Intents where ALL named devices must be resolved (partial results are misleading)
-    RELATIONAL_INTENTS = {
-        "equipment_compatibility",
-        "device_discovery",
-        "device_comparison",
-        "filtered_discovery",
-    }
-
     def __init__(self):
-        pass
+        self._response_cache = ResponseCache()
+        self._agent_cache = AgentResultCache(ttl=AGENT_CACHE_TTL_S)
+        self._engine_cache = AgentResultCache(ENGINE_CACHE_MAXSIZE, ttl=ENGINE_CACHE_TTL_S)
+        self._latency_ms = {name: deque(maxlen=LATENCY_WINDOW) for name in SUB_AGENT_TIMEOUTS_MS}
+        self._breakers = {name: CircuitBreaker(name) for name in SUB_AGENT_FALLBACKS}
+
+    async def warmup(self):
+        """
+        Build the tool registry and each LLM agent's client ahead of the first
+        request (called from app startup). The lazy path in run() stays as a
+        fallback.
+        """
+        start = time.time()
+        registry = await asyncio.to_thread(_get_tool_registry)
+        for tool in registry.values():
+            if hasattr(tool, "llm_client"):
+                tool.llm_client
+        logger.info("[Orchestrator] Warmed %s tools in %.2fs", len(registry), time.time() - start)
 
     async def run(
         self,
@@ -140,26 +371,98 @@ class Orchestrator:
         if session_state is None:
             session_state = {}
 
+        # Get the latest user message: append_turn keeps last_user_message in
+        # sync with the session's own history; scan only for other histories
+        user_message = None
+        if conversation_history is session_state.get("conversation_history"):
+            user_message = session_state.get("last_user_message")
+        if user_message is None:
+            user_message = next(
+                (m["content"] for m in reversed(conversation_history)
+                 if m.get("role") == "user" and m.get("content")),
+                "",
+            )
+
+        # Exact-match response cache (retries / reloads / SSE reconnects).
+        # Turns answering a pending clinical clarification are never cached.
+        cacheable = bool(user_message) and not session_state.get("pending_clinical_clarification")
+        if not cacheable:
+            return await self._run_pipeline(user_message, session_state, broker)
+
+        key = cache_key(user_message, session_state)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            (final_text, tool_log, chain_data), events = cached
+            logger.info("[Pipeline] Response cache hit — replaying %s events", len(events))
+            if broker:
+                for event in events:
+                    await broker.put(event)
+            token_usage = {
+                "total_input_tokens": 0,
+                "total_output_tokens": 0,
+                "total": 0,
+                "sub_agent_calls": [],
+                "response_cache_hit": True,
+            }
+            return final_text, [{"step": 0, "tool": "response_cache"}, *tool_log], token_usage, chain_data
+
+        recorder = RecordingBroker(broker)
+        context_before = context_snapshot(session_state)
+        final_text, tool_log, token_usage, chain_data = await self._run_pipeline(
+            user_message, session_state, recorder,
+        )
+
+        # Only cache complete, stateless answers: skip runs that touched
+        # clinical state or used a timeout fallback
+        stateful = (
+            context_snapshot(session_state) != context_before
+            or any(entry.get("tool") == "ais_clinical_engine" for entry in tool_log)
+        )
+        degraded = any(entry.get("fallback") for entry in tool_log)
+        if not stateful and not degraded:
+            self._response_cache.put(key, (final_text, list(tool_log), chain_data), recorder.events)
+        return final_text, tool_log, token_usage, chain_data
+
+    async def _run_pipeline(self, user_message: str, session_state: dict, broker) -> tuple:
+        """Run the full pipeline for user_message (see run)."""
         registry = _get_tool_registry()
         tool_log = []
         token_usage = {
             "total_input_tokens": 0,
             "total_output_tokens": 0,
+            "total": 0,
             "sub_agent_calls": [],
         }
 
-        # Get the latest user message
-        user_message = ""
-        for m in reversed(conversation_history):
-            if m.get("role") == "user" and m.get("content"):
-                user_message = m["content"]
-                break
+        # Speculative intent classification + equipment extraction on the raw
+        # query. Overlaps the rewriter + domain classifier; reused at Steps 3+4
+        # only if pre-processing leaves the query unchanged (up to case/whitespace).
+        # Only for standalone queries: follow-ups are nearly always rewritten,
+        # and clinical context (Steps 1b/1d) rewrites or reroutes the query.
+        classifier = registry["intent_classifier"]
+        extractor = registry["equipment_extraction"]
+        speculative_intent = speculative_extraction = None
+        if (
+            not has_prior_turns(session_state.get("conversation_history", []), user_message)
+            and not session_state.get("pending_clinical_clarification")
+            and not session_state.get("last_clinical_assessment")
+        ):
+            # Same input as the Step 3+4 calls, so both share the coalescer
+            # and AgentResultCache entry
+            speculative_intent = asyncio.create_task(
+                self._speculative_intent(classifier, user_message, session_state)
+            )
+            speculative_extraction = asyncio.create_task(
+                self._coalesced(extractor, {"normalized_query": user_message}, session_state)
+            )
+            for task in (speculative_intent, speculative_extraction):
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
         # ==============================================================
         # Step 1: Input Rewriter
         # ==============================================================
         await self._emit_status(broker, "input_rewriter", "Reading\u2026")
-        print(f"  [Pipeline] Step 1: input_rewriter")
+        logger.info("[Pipeline] Step 1: input_rewriter")
 
         rewriter = registry["input_rewriter"]
         rewriter_result = await rewriter.run(
@@ -172,21 +475,24 @@ class Orchestrator:
         normalized_query = rewriter_content.get(
             "rewritten_user_prompt", user_message
         )
-        print(f"  [Pipeline] Normalized query: {normalized_query[:150]}")
+        logger.debug("[Pipeline] Normalized query: %s", normalized_query[:150])
 
         # ==============================================================
         # Step 1b: Clinical clarification follow-up detection (deterministic)
         # ==============================================================
+        # Steps 1b and 1d both match keywords on the lowercased raw message
+        user_message_lower = user_message.lower()
         clinical_followup = False
         pending_clinical = session_state.get("pending_clinical_clarification")
         if pending_clinical:
             merged = self._merge_clinical_followup(
-                pending_clinical, normalized_query, user_message
+                pending_clinical, normalized_query, user_message,
+                query_lower=user_message_lower,
             )
             if merged:
                 # Check for unavailable data marker
                 if merged == "__UNAVAILABLE__":
-                    print(f"  [Pipeline] User cannot provide clinical data - generating conditional frameworks")
+                    logger.info("[Pipeline] User cannot provide clinical data - generating conditional frameworks")
                     session_state["clinical_data_unavailable"] = True
                     clinical_followup = True  # force clinical path so engine handles the framework
                     # Use original Turn 1 query so the engine can re-parse the full patient data
@@ -196,12 +502,12 @@ class Orchestrator:
                 else:
                     normalized_query = merged
                     clinical_followup = True
-                    print(f"  [Pipeline] Clinical follow-up merged: {normalized_query[:150]}")
+                    logger.debug("[Pipeline] Clinical follow-up merged: %s", normalized_query[:150])
                     session_state.pop("pending_clinical_clarification", None)
             else:
                 # User changed topic — clear stale pending context
                 session_state.pop("pending_clinical_clarification", None)
-                print(f"  [Pipeline] Pending clinical context cleared (topic change)")
+                logger.info("[Pipeline] Pending clinical context cleared (topic change)")
 
         # ==============================================================
         # Step 1d: Post-assessment guideline query enrichment (deterministic)
@@ -213,17 +519,18 @@ class Orchestrator:
             enriched_query = self._enrich_guideline_query(
                 normalized_query, raw_query=user_message,
                 clinical_context=last_clinical,
+                query_lower=user_message_lower,
             )
             if enriched_query:
                 normalized_query = enriched_query
                 guideline_enriched = True
-                print(f"  [Pipeline] Guideline query enriched with clinical context")
+                logger.info("[Pipeline] Guideline query enriched with clinical context")
 
         # ==============================================================
         # Step 2: Domain Classification (equipment | clinical | other)
         # ==============================================================
         await self._emit_status(broker, "domain_classifier", "Classifying Domain\u2026")
-        print(f"  [Pipeline] Step 2: domain_classifier")
+        logger.info("[Pipeline] Step 2: domain_classifier")
 
         domain_result = await registry["domain_classifier"].run(
             {"normalized_query": normalized_query}, session_state
@@ -237,13 +544,17 @@ class Orchestrator:
         # Override domain for clinical follow-up (deterministic)
         if clinical_followup:
             domain = "clinical"
-            print(f"  [Pipeline] Force domain: clinical (follow-up)")
+            logger.info("[Pipeline] Force domain: clinical (follow-up)")
 
         # ----------------------------------------------------------
         # Fast exit: other → general output agent
         # ----------------------------------------------------------
+        if domain in ("other", "clinical", "sales"):
+            self._discard_speculative(speculative_intent, token_usage, "intent_classifier")
+            self._discard_speculative(speculative_extraction, token_usage, "equipment_extraction")
+
         if domain == "other":
-            print(f"  [Pipeline] Domain=other -> general path")
+            logger.info("[Pipeline] Domain=other -> general path")
             return await self._run_general_path(
                 registry, user_message, session_state, broker,
                 tool_log, token_usage,
@@ -253,7 +564,7 @@ class Orchestrator:
         # Clinical path: notify frontend, don't process here
         # ----------------------------------------------------------
         if domain == "clinical":
-            print(f"  [Pipeline] Domain=clinical -> sending clinical_redirect to frontend")
+            logger.info("[Pipeline] Domain=clinical -> sending clinical_redirect to frontend")
             await self._emit_status(broker, "domain_classifier", "Clinical query detected")
             if broker:
                 await broker.put({
@@ -271,7 +582,7 @@ class Orchestrator:
         # Sales path: notify frontend, don't process here
         # ----------------------------------------------------------
         if domain == "sales":
-            print(f"  [Pipeline] Domain=sales -> sending sales_redirect to frontend")
+            logger.info("[Pipeline] Domain=sales -> sending sales_redirect to frontend")
             await self._emit_status(broker, "domain_classifier", "Sales query detected")
             if broker:
                 await broker.put({
@@ -290,20 +601,69 @@ class Orchestrator:
         # ==============================================================
         await self._emit_status(broker, "intent_classifier", "Understanding Intent\u2026")
         await self._emit_status(broker, "equipment_extraction", "Extracting Devices\u2026")
-        print(f"  [Pipeline] Steps 3+4: intent_classifier + equipment_extraction (parallel)")
+        logger.info("[Pipeline] Steps 3+4: intent_classifier + equipment_extraction (parallel)")
 
-        classifier = registry["intent_classifier"]
-        extractor = registry["equipment_extraction"]
+        if speculative_intent is not None and self._speculation_holds(user_message, normalized_query):
+            intent_call, extraction_call = speculative_intent, speculative_extraction
+            logger.info("[Pipeline] Reusing speculative intent classification + extraction")
+        else:
+            self._discard_speculative(speculative_intent, token_usage, "intent_classifier")
+            self._discard_speculative(speculative_extraction, token_usage, "equipment_extraction")
+            intent_call = self._coalesced(classifier, {"normalized_query": normalized_query}, session_state)
+            extraction_call = self._coalesced(extractor, {"normalized_query": normalized_query}, session_state)
+
+        intent_task = asyncio.create_task(self._bounded("intent_classifier", intent_call))
+        extraction_task = asyncio.create_task(self._bounded("equipment_extraction", extraction_call))
+        for task in (intent_task, extraction_task):
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            await asyncio.wait((intent_task, extraction_task), return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            intent_task.cancel()
+            extraction_task.cancel()
+            raise
+
+        # General fast path: the classifier answered "general" before the
+        # extraction finished — its result is never used, so cancel it
+        if not extraction_task.done() and self._is_general_intent(intent_task):
+            extraction_task.cancel()
+            wasted = self._speculative_wasted(token_usage)
+            wasted["calls"] += 1
+            wasted["cancelled"] += 1
+            intent_result = intent_task.result()
+            self._track_usage(token_usage, "intent_classifier", intent_result)
+            tool_log.append(self._log_entry(3, "intent_classifier", intent_result))
+            logger.info("[Pipeline] Equipment intent: general -> general path (extraction cancelled)")
+            return await self._run_general_path(
+                registry, user_message, session_state, broker,
+                tool_log, token_usage,
+            )
 
-        intent_result, extraction_result = await asyncio.gather(
-            classifier.run({"normalized_query": normalized_query}, session_state),
-            extractor.run({"normalized_query": normalized_query}, session_state),
-        )
+        try:
+            extraction_result = await extraction_task
+        except BaseException:
+            intent_task.cancel()
+            raise
+
+        # Speculative generic pipeline: generic_specs are known before the
+        # intent is — start it now, keep it only for COMPAT_INTENTS (Step 3b)
+        speculative_generic = None
+        early_generic_specs = extraction_result.get("content", {}).get("generic_specs", [])
+        if early_generic_specs and not intent_task.done():
+            speculative_generic = self._start_speculative_generic(
+                registry, user_message, early_generic_specs, session_state,
+            )
+
+        try:
+            intent_result = await intent_task
+        except BaseException:
+            self._discard_speculative_generic(speculative_generic, token_usage)
+            raise
 
         self._track_usage(token_usage, "intent_classifier", intent_result)
-        tool_log.append({"step": 3, "tool": "intent_classifier"})
+        tool_log.append(self._log_entry(3, "intent_classifier", intent_result))
         self._track_usage(token_usage, "equipment_extraction", extraction_result)
-        tool_log.append({"step": 4, "tool": "equipment_extraction"})
+        tool_log.append(self._log_entry(4, "equipment_extraction", extraction_result))
 
         # Parse intent results
         intent_data = intent_result.get("content", {})
@@ -316,40 +676,53 @@ class Orchestrator:
         clinical_hybrid = False
         hybrid_mode = None
 
-        print(f"  [Pipeline] Equipment intent: {primary_intent}, "
-              f"multi={is_multi_intent}, planning={needs_planning}")
+        logger.info(
+            "[Pipeline] Equipment intent: %s, multi=%s, planning=%s",
+            primary_intent, is_multi_intent, needs_planning,
+        )
 
         # Parse extraction results
         extraction = extraction_result.get("content", {})
         devices = extraction.get("devices", {})
         categories = extraction.get("categories", [])
-        generic_specs = extraction.get("generic_specs", [])
-        not_found = extraction.get("not_found", [])
+        generic_specs = extraction.get("generic_specs", _EMPTY_LIST)
+        not_found = extraction.get("not_found", _EMPTY_LIST)
 
         # Re-route device_definition to database when devices are resolved
         if primary_intent == "device_definition" and devices:
             primary_intent = "specification_lookup"
-            print(f"  [Pipeline] Re-routed device_definition -> specification_lookup (devices found)")
+            logger.info("[Pipeline] Re-routed device_definition -> specification_lookup (devices found)")
 
         # ==============================================================
         # Validation Gate: Unresolved Device Clarification
         # ==============================================================
         if not_found:
-            suggestions = self._get_fuzzy_suggestions(not_found)
+            # Fuzzy suggestions run in a worker thread; relational intents need
+            # them now, other paths await them only when building output input
+            suggestions_task = asyncio.create_task(
+                asyncio.to_thread(self._get_fuzzy_suggestions, not_found)
+            )
+            suggestions_task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
-            if primary_intent in self.RELATIONAL_INTENTS:
+            if primary_intent in RELATIONAL_INTENTS:
                 # Full stop — relational intents need all devices
-                print(f"  [Pipeline] STOP: unresolved devices {not_found} "
-                      f"in relational intent={primary_intent}")
+                logger.info(
+                    "[Pipeline] STOP: unresolved devices %s in relational intent=%s",
+                    not_found, primary_intent,
+                )
+                suggestions = await suggestions_task
+                self._discard_speculative_generic(speculative_generic, token_usage)
                 return await self._run_clarification_path(
                     registry, user_message, devices, not_found, suggestions,
                     session_state, broker, tool_log, token_usage,
                 )
             else:
                 # Proceed with partial — enrich extraction for inline note
-                print(f"  [Pipeline] PARTIAL: unresolved devices {not_found} "
-                      f"in lookup intent={primary_intent}, proceeding with found devices")
-                extraction["not_found_suggestions"] = suggestions
+                logger.info(
+                    "[Pipeline] PARTIAL: unresolved devices %s in lookup intent=%s, proceeding with found devices",
+                    not_found, primary_intent,
+                )
+                extraction["_suggestions_task"] = suggestions_task
 
         # ==============================================================
         # Step 3b-3d: Generic Device Pipeline (conditional on intent)
@@ -357,19 +730,28 @@ class Orchestrator:
         # Only run when generic_specs exist AND the intent requires
         # synthetic devices for compatibility evaluation.
         request_db = None
-        if generic_specs and primary_intent in self.COMPAT_INTENTS:
-            generic_result = await self._run_generic_pipeline(
-                registry, user_message, generic_specs, devices,
-                session_state, broker, tool_log, token_usage,
-            )
+        if generic_specs and primary_intent in COMPAT_INTENTS:
+            if speculative_generic is not None:
+                logger.info("[Pipeline] Using speculative generic pipeline")
+                generic_result = await self._join_speculative_generic(
+                    speculative_generic, broker, tool_log, token_usage,
+                )
+            else:
+                generic_result = await self._run_generic_pipeline(
+                    registry, user_message, generic_specs, devices,
+                    session_state, broker, tool_log, token_usage,
+                )
             if generic_result.get("synthetic_devices"):
                 devices.update(generic_result["synthetic_devices"])
             if generic_result.get("insufficient_devices"):
                 session_state["generic_insufficient"] = generic_result["insufficient_devices"]
             request_db = generic_result.get("request_db")
         elif generic_specs:
-            print(f"  [Pipeline] Skipping generic pipeline: "
-                  f"intent={primary_intent} does not require synthetic devices")
+            logger.info(
+                "[Pipeline] Skipping generic pipeline: intent=%s does not require synthetic devices",
+                primary_intent,
+            )
+            self._discard_speculative_generic(speculative_generic, token_usage)
 
         # ==============================================================
         # Step 4: Route by intent
@@ -397,15 +779,16 @@ class Orchestrator:
     ) -> tuple:
         """Route to the correct engine path based on classified intent."""
 
-        constraints = extraction.get("constraints", [])
+        constraints = extraction.get("constraints", _EMPTY_LIST)
 
         # Planning path: filtered_discovery, needs_planning flag,
         # constraints detected (backward-compat safety net),
         # or clinical_hybrid (device + clinical in one query)
         if primary_intent == "filtered_discovery" or needs_planning or constraints or clinical_hybrid:
-            print(f"  [Pipeline] Route: planned path "
-                  f"(intent={primary_intent}, planning={needs_planning}, "
-                  f"constraints={bool(constraints)}, hybrid={clinical_hybrid})")
+            logger.info(
+                "[Pipeline] Route: planned path (intent=%s, planning=%s, constraints=%s, hybrid=%s)",
+                primary_intent, needs_planning, bool(constraints), clinical_hybrid,
+            )
             return await self._run_planned_path(
                 registry, normalized_query, devices, categories,
                 constraints, extraction, session_state, broker,
@@ -415,10 +798,10 @@ class Orchestrator:
                 hybrid_mode=hybrid_mode,
             )
 
-        engine = self.INTENT_ENGINE_MAP.get(primary_intent, "general")
+        engine = INTENT_ENGINE_MAP.get(primary_intent, "general")
 
         if engine == "chain":
-            print(f"  [Pipeline] Route: chain path (intent={primary_intent})")
+            logger.info("[Pipeline] Route: chain path (intent=%s)", primary_intent)
             return await self._run_chain_path(
                 registry, normalized_query, devices, categories,
                 extraction, session_state, broker, tool_log, token_usage,
@@ -426,7 +809,7 @@ class Orchestrator:
             )
 
         if engine == "database":
-            print(f"  [Pipeline] Route: database path (intent={primary_intent})")
+            logger.info("[Pipeline] Route: database path (intent=%s)", primary_intent)
             return await self._run_database_path(
                 registry, normalized_query, devices, categories,
                 extraction, session_state, broker, tool_log, token_usage,
@@ -434,7 +817,7 @@ class Orchestrator:
             )
 
         if engine == "vector":
-            print(f"  [Pipeline] Route: vector path (intent={primary_intent})")
+            logger.info("[Pipeline] Route: vector path (intent=%s)", primary_intent)
             return await self._run_vector_path(
                 registry, normalized_query, devices, categories,
                 extraction, intent_data, session_state, broker, tool_log, token_usage,
@@ -442,7 +825,7 @@ class Orchestrator:
             )
 
         if engine == "clinical":
-            print(f"  [Pipeline] Route: clinical path (intent={primary_intent})")
+            logger.info("[Pipeline] Route: clinical path (intent=%s)", primary_intent)
             return await self._run_clinical_path(
                 registry, normalized_query, devices, categories,
                 extraction, session_state, broker, tool_log, token_usage,
@@ -450,14 +833,14 @@ class Orchestrator:
             )
 
         if engine == "research":
-            print(f"  [Pipeline] Route: research path (stubbed)")
+            logger.info("[Pipeline] Route: research path (stubbed)")
             return await self._run_research_stub(
                 registry, user_message, session_state, broker,
                 tool_log, token_usage,
             )
 
         # Fallback
-        print(f"  [Pipeline] Route: general path (intent={primary_intent})")
+        logger.info("[Pipeline] Route: general path (intent=%s)", primary_intent)
         return await self._run_general_path(
             registry, user_message, session_state, broker,
             tool_log, token_usage,
@@ -473,17 +856,19 @@ class Orchestrator:
         user_message, request_db=None,
     ) -> tuple:
         """Run: chain_engine → chain_output_agent → return."""
+        generic_specs = extraction.get("generic_specs", _EMPTY_LIST)
+        not_found = extraction.get("not_found", _EMPTY_LIST)
 
         # Step 3: Chain Engine
         await self._emit_status(broker, "chain_engine", "Processing Connections\u2026")
-        print(f"  [Pipeline] Step 3: chain_engine")
+        logger.info("[Pipeline] Step 3: chain_engine")
 
         engine = registry["chain_engine"]
         engine_input = {
             "normalized_query": normalized_query,
             "devices": devices,
             "categories": categories,
-            "generic_specs": extraction.get("generic_specs", []),
+            "generic_specs": generic_specs,
         }
         if request_db is not None:
             engine_input["database"] = request_db
@@ -498,7 +883,7 @@ class Orchestrator:
 
         # Step 4: Chain Output Agent
         await self._emit_status(broker, "chain_output_agent", "Generating Answer\u2026")
-        print(f"  [Pipeline] Step 4: chain_output_agent")
+        logger.info("[Pipeline] Step 4: chain_output_agent")
 
         output_agent = registry["chain_output_agent"]
         output_input = {
@@ -512,8 +897,8 @@ class Orchestrator:
             "chains_tested": engine_data.get("chains_tested", []),
             "decision": engine_data.get("decision", {}),
             "subset_analysis": engine_data.get("subset_analysis"),
-            "not_found": extraction.get("not_found", []),
-            "not_found_suggestions": extraction.get("not_found_suggestions", {}),
+            "not_found": not_found,
+            "not_found_suggestions": await self._await_suggestions(extraction),
         }
         output_result = await output_agent.run(output_input, session_state, broker=broker)
         self._track_usage(token_usage, "chain_output_agent", output_result)
@@ -525,8 +910,8 @@ class Orchestrator:
             output_content.get("raw_text", "Unable to format response."),
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, flat_data
 
@@ -540,17 +925,19 @@ class Orchestrator:
         user_message,
     ) -> tuple:
         """Run: database_engine → database_output_agent → return."""
+        generic_specs = extraction.get("generic_specs", _EMPTY_LIST)
+        not_found = extraction.get("not_found", _EMPTY_LIST)
 
         # Step 3: Database Engine
         await self._emit_status(broker, "database_engine", "Searching Database\u2026")
-        print(f"  [Pipeline] Step 3: database_engine")
+        logger.info("[Pipeline] Step 3: database_engine")
 
         engine = registry["database_engine"]
         engine_input = {
             "normalized_query": normalized_query,
             "devices": devices,
             "categories": categories,
-            "generic_specs": extraction.get("generic_specs", []),
+            "generic_specs": generic_specs,
         }
         engine_result = await engine.run(engine_input, session_state)
         self._track_usage(token_usage, "database_engine", engine_result)
@@ -561,7 +948,7 @@ class Orchestrator:
 
         # Step 4: Database Output Agent
         await self._emit_status(broker, "database_output_agent", "Generating Answer\u2026")
-        print(f"  [Pipeline] Step 4: database_output_agent")
+        logger.info("[Pipeline] Step 4: database_output_agent")
 
         output_agent = registry["database_output_agent"]
         output_input = {
@@ -569,9 +956,9 @@ class Orchestrator:
             "query_spec": engine_data.get("query_spec", {}),
             "summary": engine_data.get("summary", ""),
             "device_list": device_list,
-            "not_found": extraction.get("not_found", []),
-            "not_found_suggestions": extraction.get("not_found_suggestions", {}),
-            "generic_specs": extraction.get("generic_specs", []),
+            "not_found": not_found,
+            "not_found_suggestions": await self._await_suggestions(extraction),
+            "generic_specs": generic_specs,
         }
         output_result = await output_agent.run(output_input, session_state, broker=broker)
         self._track_usage(token_usage, "database_output_agent", output_result)
@@ -583,8 +970,8 @@ class Orchestrator:
             output_content.get("raw_text", "Unable to format response."),
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         # device_list already streamed as query_result_device_chunk by database_output_agent
         return final_text, tool_log, token_usage, None
@@ -607,10 +994,15 @@ class Orchestrator:
         2. Execute plan steps (wave-based parallel: database → chain, etc.)
         3. Run the specified output agent
         """
+        generic_specs = extraction.get("generic_specs", _EMPTY_LIST)
+        not_found = extraction.get("not_found", _EMPTY_LIST)
+
         # Step 3a: Query Planner (+ clinical engine if hybrid)
         await self._emit_status(broker, "query_planner", "Planning Approach\u2026")
-        print(f"  [Pipeline] Step 3a: query_planner"
-              + (f" + ais_clinical_engine ({hybrid_mode or 'independent'})" if clinical_hybrid else ""))
+        logger.info(
+            "[Pipeline] Step 3a: query_planner%s",
+            f" + ais_clinical_engine ({hybrid_mode or 'independent'})" if clinical_hybrid else "",
+        )
 
         planner = registry["query_planner"]
         planner_input = {
@@ -618,7 +1010,7 @@ class Orchestrator:
             "devices": devices,
             "categories": categories,
             "constraints": constraints,
-            "generic_specs": extraction.get("generic_specs", []),
+            "generic_specs": generic_specs,
         }
 
         clinical_result = None
@@ -638,12 +1030,12 @@ class Orchestrator:
             )
             self._track_usage(token_usage, "ais_clinical_engine", clinical_result)
             tool_log.append({"step": "3a_clinical", "tool": "ais_clinical_engine"})
-            print(f"  [Pipeline] Clinical engine status: {clinical_result.get('status')}")
+            logger.info("[Pipeline] Clinical engine status: %s", clinical_result.get("status"))
         elif clinical_hybrid:
             # Dependent: run planner first, clinical deferred to after plan steps
             planner_result = await planner.run(planner_input, session_state)
             clinical_deferred = True
-            print(f"  [Pipeline] Clinical engine deferred (dependent mode)")
+            logger.info("[Pipeline] Clinical engine deferred (dependent mode)")
         else:
             planner_result = await planner.run(planner_input, session_state)
 
@@ -655,21 +1047,42 @@ class Orchestrator:
         output_agent_name = plan.get("output_agent", "database_output_agent")
 
         if not steps:
-            print("  [Pipeline] Planner returned no steps, falling back to database path")
+            logger.info("[Pipeline] Planner returned no steps, falling back to database path")
             return await self._run_database_path(
                 registry, normalized_query, devices, categories,
                 extraction, session_state, broker, tool_log, token_usage,
                 user_message,
             )
 
-        # Execute plan steps (wave-based parallel execution)
+        # Execute plan steps (wave-based parallel execution).
+        # Results are stored once under store_as (what the output agents
+        # read); step_id -> store_as aliases serve inject_devices_from.
         step_results = {}
+        step_aliases = {}
 
-        # Infer depends_on from inject_devices_from for backward compatibility
+        def store_step(step_id, store_as, result):
+            step_results[store_as] = result
+            if step_id != store_as:
+                step_aliases[step_id] = store_as
+
+        def lookup_step(key):
+            return step_results.get(step_aliases.get(key, key))
+
+        # Extraction constraints by field (last value wins), injected into
+        # database steps whose filters don't already cover the field
+        constraint_map = {
+            c["field"]: c["value"] for c in constraints if c.get("field") and c.get("value")
+        }
+
+        # Infer depends_on from inject_devices_from for backward compatibility;
+        # note the first chain step (synthesis returns its flat_data)
+        chain_store_as = None
         for step in steps:
             if "depends_on" not in step:
                 inject_from = step.get("inject_devices_from")
                 step["depends_on"] = [inject_from] if inject_from else []
+            if chain_store_as is None and step.get("engine") == "chain":
+                chain_store_as = step.get("store_as", "")
 
         async def execute_step(step):
             """Execute a single plan step. Closure captures all pipeline locals."""
@@ -680,7 +1093,7 @@ class Orchestrator:
 
             if engine_type == "database":
                 await self._emit_status(broker, "database_engine", "Searching Database\u2026")
-                print(f"  [Pipeline] Plan step {step_id}: database_engine ({action})")
+                logger.info("[Pipeline] Plan step %s: database_engine (%s)", step_id, action)
 
                 db_engine = registry["database_engine"]
                 db_input = {
@@ -694,39 +1107,38 @@ class Orchestrator:
 
                 # Safety net: inject extraction constraints the planner may have missed
                 existing_fields = {f.get("field") for f in db_input["query_spec"]["filters"]}
-                for constraint in constraints:
-                    c_field = constraint.get("field")
-                    c_value = constraint.get("value")
-                    if c_field and c_value and c_field not in existing_fields:
+                for c_field, c_value in constraint_map.items():
+                    if c_field not in existing_fields:
                         db_input["query_spec"]["filters"].append({
                             "field": c_field,
                             "operator": "contains",
                             "value": c_value,
                         })
-                        print(f"    Injected constraint: {c_field} contains {c_value}")
+                        logger.debug("  Injected constraint: %s contains %s", c_field, c_value)
 
                 db_result = await db_engine.run(db_input, session_state)
                 self._track_usage(token_usage, "database_engine", db_result)
                 tool_log.append({"step": f"3b_{step_id}", "tool": "database_engine"})
 
-                step_results[store_as] = db_result
-                step_results[step_id] = db_result
+                store_step(step_id, store_as, db_result)
 
-                device_list = db_result.get("data", {}).get("device_list", [])
-                print(f"    -> {len(device_list)} devices")
-                sample = [d.get("product_name", "?") for d in device_list[:5]]
-                print(f"    -> Sample products: {sample}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    device_list = db_result.get("data", {}).get("device_list", [])
+                    logger.debug("  -> %s devices", len(device_list))
+                    sample = [d.get("product_name", "?") for d in device_list[:5]]
+                    logger.debug("  -> Sample products: %s", sample)
 
             elif engine_type == "chain":
                 await self._emit_status(broker, "chain_engine", "Processing Connections\u2026")
-                print(f"  [Pipeline] Plan step {step_id}: chain_engine ({action})")
+                logger.info("[Pipeline] Plan step %s: chain_engine (%s)", step_id, action)
 
                 prior_results = []
                 inject_from = step.get("inject_devices_from")
-                if inject_from and inject_from in step_results:
-                    prior_results.append(step_results[inject_from])
-                    db_count = len(step_results[inject_from].get("data", {}).get("device_list", []))
-                    print(f"    Passing {db_count} DB-filtered devices via prior_results")
+                prior = lookup_step(inject_from) if inject_from else None
+                if prior is not None:
+                    prior_results.append(prior)
+                    db_count = len(prior.get("data", {}).get("device_list", []))
+                    logger.debug("  Passing %s DB-filtered devices via prior_results", db_count)
 
                 filter_category = steps[0].get("category", "device") if steps else "device"
 
@@ -745,15 +1157,14 @@ class Orchestrator:
                 tool_log.append({"step": f"3b_{step_id}", "tool": "chain_engine"})
 
                 chain_eng_data = chain_result.get("data", {})
-                print(f"    Chain engine status: {chain_result.get('status')}")
-                print(f"    flat_data length: {len(chain_eng_data.get('flat_data', []))}")
+                logger.debug("  Chain engine status: %s", chain_result.get("status"))
+                logger.debug("  flat_data length: %s", len(chain_eng_data.get("flat_data", [])))
 
-                step_results[store_as] = chain_result
-                step_results[step_id] = chain_result
+                store_step(step_id, store_as, chain_result)
 
             elif engine_type == "vector":
                 await self._emit_status(broker, "vector_engine", "Searching Documents\u2026")
-                print(f"  [Pipeline] Plan step {step_id}: vector_engine ({action})")
+                logger.info("[Pipeline] Plan step %s: vector_engine (%s)", step_id, action)
 
                 vector_engine = registry["vector_engine"]
 
@@ -764,16 +1175,22 @@ class Orchestrator:
                         vector_devices[dev_name] = devices[dev_name]
 
                 inject_from = step.get("inject_devices_from")
-                if inject_from and inject_from in step_results:
-                    prior = step_results[inject_from]
+                prior = lookup_step(inject_from) if inject_from else None
+                if prior is not None:
                     prior_devices = prior.get("data", {}).get("device_list", [])
+                    seen_ids = {}  # dev_name -> set of ids already in vector_devices[dev_name]["ids"]
                     for dev in prior_devices:
                         dev_name = dev.get("product_name", dev.get("device_name", ""))
                         dev_id = dev.get("id")
                         if dev_name and dev_id:
                             if dev_name not in vector_devices:
                                 vector_devices[dev_name] = {"ids": []}
-                            vector_devices[dev_name]["ids"].append(dev_id)
+                            seen = seen_ids.get(dev_name)
+                            if seen is None:
+                                seen = seen_ids[dev_name] = set(vector_devices[dev_name].get("ids", ()))
+                            if dev_id not in seen:
+                                seen.add(dev_id)
+                                vector_devices[dev_name].setdefault("ids", []).append(dev_id)
 
                 vector_query = step.get("query_focus", normalized_query)
 
@@ -783,44 +1200,23 @@ class Orchestrator:
                     "classification": {},
                     "intent": intent_data,  # Pass intent for prognosis detection & store routing
                 }
-                vector_result = await vector_engine.run(vector_input, session_state)
+                vector_result = await self._cached_engine_run(
+                    "vector_engine", vector_engine, vector_input, session_state, token_usage,
+                )
                 self._track_usage(token_usage, "vector_engine", vector_result)
                 tool_log.append({"step": f"3b_{step_id}", "tool": "vector_engine"})
 
                 chunk_count = len(vector_result.get("data", {}).get("chunks", []))
-                print(f"    -> {chunk_count} document chunks")
-
-                step_results[store_as] = vector_result
-                step_results[step_id] = vector_result
-
-        # Wave-based execution: run independent steps in parallel
-        completed = set()
-        remaining = list(steps)
-
-        while remaining:
-            ready = [s for s in remaining
-                     if all(d in completed for d in s.get("depends_on", []))]
+                logger.debug("  -> %s document chunks", chunk_count)
 
-            if not ready:
-                print(f"  [Pipeline] WARNING: {len(remaining)} steps stuck (circular deps?), running sequentially")
-                for s in remaining:
-                    await execute_step(s)
-                break
+                store_step(step_id, store_as, vector_result)
 
-            if len(ready) > 1:
-                print(f"  [Pipeline] Running {len(ready)} steps in parallel: {[s['step_id'] for s in ready]}")
-                await asyncio.gather(*[execute_step(s) for s in ready])
-            else:
-                await execute_step(ready[0])
-
-            for s in ready:
-                completed.add(s.get("step_id", ""))
-            remaining = [s for s in remaining if s.get("step_id", "") not in completed]
+        await self._execute_plan(steps, execute_step)
 
         # Deferred clinical execution (dependent mode: runs after plan steps)
         if clinical_deferred:
             await self._emit_status(broker, "ais_clinical_engine", "Evaluating Eligibility\u2026")
-            print(f"  [Pipeline] Running deferred clinical engine (dependent mode)")
+            logger.info("[Pipeline] Running deferred clinical engine (dependent mode)")
             clinical_engine = registry["ais_clinical_engine"]
             clinical_input = {
                 "normalized_query": normalized_query,
@@ -829,21 +1225,22 @@ class Orchestrator:
             clinical_result = await clinical_engine.run(clinical_input, session_state)
             self._track_usage(token_usage, "ais_clinical_engine", clinical_result)
             tool_log.append({"step": "3b_clinical", "tool": "ais_clinical_engine"})
-            print(f"  [Pipeline] Deferred clinical engine status: {clinical_result.get('status')}")
+            logger.info("[Pipeline] Deferred clinical engine status: %s", clinical_result.get("status"))
 
         # Inject clinical result into step_results (hybrid path)
         if clinical_result:
             # Handle clarification: pre-format deterministically
             if clinical_result.get("status") == "needs_clarification":
+                clinical_data = clinical_result.get("data", _EMPTY_DICT)
                 clinical_result["_clarification_text"] = self._format_clinical_clarification(
-                    clinical_result.get("data", {})
+                    clinical_data
                 )
                 session_state["pending_clinical_clarification"] = {
-                    "patient": clinical_result.get("data", {}).get("patient", {}),
-                    "completeness": clinical_result.get("data", {}).get("completeness", {}),
+                    "patient": clinical_data.get("patient", {}),
+                    "completeness": clinical_data.get("completeness", {}),
                     "original_query": user_message,
                 }
-                print(f"  [Pipeline] Clinical needs clarification — stored pending context")
+                logger.info("[Pipeline] Clinical needs clarification — stored pending context")
 
             step_results["clinical_assessment"] = clinical_result
             plan["steps"].append({
@@ -854,16 +1251,19 @@ class Orchestrator:
                 "depends_on": [],
             })
             output_agent_name = "synthesis_output_agent"
-            print(f"  [Pipeline] Hybrid: injected clinical result, forcing synthesis_output_agent")
+            logger.info("[Pipeline] Hybrid: injected clinical result, forcing synthesis_output_agent")
 
         # Step 4: Output agent
+        # Nothing to prepare ahead of the last step: each output agent's fixed
+        # setup (SKILL.md prompt, LLM client) is done once in warmup, and its
+        # user prompt is built from every step's result.
         last_store_as = steps[-1].get("store_as", "")
         last_result = step_results.get(last_store_as, {})
 
         if output_agent_name == "chain_output_agent" and isinstance(last_result, dict):
             # Chain engine result — use chain output agent
             await self._emit_status(broker, "chain_output_agent", "Generating Answer\u2026")
-            print(f"  [Pipeline] Step 4: chain_output_agent")
+            logger.info("[Pipeline] Step 4: chain_output_agent")
 
             engine_data = last_result.get("data", {})
             classification = last_result.get("classification", {})
@@ -882,8 +1282,8 @@ class Orchestrator:
                 "chains_tested": engine_data.get("chains_tested", []),
                 "decision": engine_data.get("decision", {}),
                 "subset_analysis": engine_data.get("subset_analysis"),
-                "not_found": extraction.get("not_found", []),
-                "not_found_suggestions": extraction.get("not_found_suggestions", {}),
+                "not_found": not_found,
+                "not_found_suggestions": await self._await_suggestions(extraction),
             }
             output_result = await output_agent.run(output_input, session_state, broker=broker)
             self._track_usage(token_usage, "chain_output_agent", output_result)
@@ -895,16 +1295,19 @@ class Orchestrator:
                 output_content.get("raw_text", "Unable to format response."),
             )
 
-            total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-            print(f"  [Pipeline] Complete. {total} total tokens")
-            print(f"  [Pipeline] Returning flat_data with {len(flat_data)} records (truthy: {bool(flat_data)})")
+            total = token_usage["total"]
+            logger.info("[Pipeline] Complete. %s total tokens", total)
+            logger.debug(
+                "[Pipeline] Returning flat_data with %s records (truthy: %s)",
+                len(flat_data), bool(flat_data),
+            )
 
             return final_text, tool_log, token_usage, flat_data
 
         elif output_agent_name == "vector_output_agent" and isinstance(last_result, dict):
             # Vector-only result — use vector output agent
             await self._emit_status(broker, "vector_output_agent", "Generating Answer\u2026")
-            print(f"  [Pipeline] Step 4: vector_output_agent")
+            logger.info("[Pipeline] Step 4: vector_output_agent")
 
             output_agent = registry["vector_output_agent"]
             output_input = {
@@ -912,8 +1315,8 @@ class Orchestrator:
                 "normalized_query": normalized_query,
                 "data": last_result.get("data", {}),
                 "classification": last_result.get("classification", {}),
-                "not_found": extraction.get("not_found", []),
-                "not_found_suggestions": extraction.get("not_found_suggestions", {}),
+                "not_found": not_found,
+                "not_found_suggestions": await self._await_suggestions(extraction),
             }
             output_result = await output_agent.run(output_input, session_state, broker=broker)
             self._track_usage(token_usage, "vector_output_agent", output_result)
@@ -925,17 +1328,18 @@ class Orchestrator:
                 output_content.get("raw_text", "Unable to format response."),
             )
 
-            total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-            print(f"  [Pipeline] Complete. {total} total tokens")
+            total = token_usage["total"]
+            logger.info("[Pipeline] Complete. %s total tokens", total)
 
             return final_text, tool_log, token_usage, None
 
         elif output_agent_name == "synthesis_output_agent":
             # Multi-engine synthesis — combine all step results
             await self._emit_status(broker, "synthesis_output_agent", "Synthesizing Answer\u2026")
-            print(f"  [Pipeline] Step 4: synthesis_output_agent")
+            logger.info("[Pipeline] Step 4: synthesis_output_agent")
 
             output_agent = registry["synthesis_output_agent"]
+            await self._await_suggestions(extraction)
             output_input = {
                 "user_query": user_message,
                 "normalized_query": normalized_query,
@@ -955,22 +1359,19 @@ class Orchestrator:
 
             # Extract flat_data from chain step if present
             flat_data = None
-            for step in steps:
-                if step.get("engine") == "chain":
-                    chain_store = step.get("store_as", "")
-                    chain_result = step_results.get(chain_store, {})
-                    flat_data = chain_result.get("data", {}).get("flat_data", []) or None
-                    break
+            if chain_store_as is not None:
+                chain_result = step_results.get(chain_store_as, _EMPTY_DICT)
+                flat_data = chain_result.get("data", _EMPTY_DICT).get("flat_data") or None
 
-            total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-            print(f"  [Pipeline] Complete. {total} total tokens")
+            total = token_usage["total"]
+            logger.info("[Pipeline] Complete. %s total tokens", total)
 
             return final_text, tool_log, token_usage, flat_data
 
         else:
             # Database-only result — use database output agent
             await self._emit_status(broker, "database_output_agent", "Generating Answer\u2026")
-            print(f"  [Pipeline] Step 4: database_output_agent")
+            logger.info("[Pipeline] Step 4: database_output_agent")
 
             last_data = last_result.get("data", {}) if isinstance(last_result, dict) else {}
             device_list = last_data.get("device_list", [])
@@ -981,9 +1382,9 @@ class Orchestrator:
                 "query_spec": last_data.get("query_spec", {}),
                 "summary": last_data.get("summary", ""),
                 "device_list": device_list,
-                "not_found": extraction.get("not_found", []),
-                "not_found_suggestions": extraction.get("not_found_suggestions", {}),
-                "generic_specs": extraction.get("generic_specs", []),
+                "not_found": not_found,
+                "not_found_suggestions": await self._await_suggestions(extraction),
+                "generic_specs": generic_specs,
             }
             output_result = await output_agent.run(output_input, session_state, broker=broker)
             self._track_usage(token_usage, "database_output_agent", output_result)
@@ -995,8 +1396,8 @@ class Orchestrator:
                 output_content.get("raw_text", "Unable to format response."),
             )
 
-            total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-            print(f"  [Pipeline] Complete. {total} total tokens")
+            total = token_usage["total"]
+            logger.info("[Pipeline] Complete. %s total tokens", total)
 
             # device_list already streamed as query_result_device_chunk by database_output_agent
             return final_text, tool_log, token_usage, None
@@ -1011,18 +1412,22 @@ class Orchestrator:
     def _db_results_to_chain_devices(self, device_list: list) -> dict:
         """Convert database filter results into chain engine device format."""
         by_product = {}
+        seen_ids = {}  # product -> set of ids already in by_product[product]["ids"]
         for device in device_list:
             product = device.get("product_name", "Unknown")
             if product == "Unknown":
                 continue
-            if product not in by_product:
-                by_product[product] = {
+            entry = by_product.get(product)
+            if entry is None:
+                entry = by_product[product] = {
                     "ids": [],
                     "conical_category": device.get("conical_category", "Unknown"),
                 }
+                seen_ids[product] = set()
             dev_id = device.get("device_id")
-            if dev_id and dev_id not in by_product[product]["ids"]:
-                by_product[product]["ids"].append(dev_id)
+            if dev_id and dev_id not in seen_ids[product]:
+                seen_ids[product].add(dev_id)
+                entry["ids"].append(dev_id)
         return by_product
 
     # ------------------------------------------------------------------
@@ -1049,7 +1454,7 @@ class Orchestrator:
 
         # Step 2b: Structure raw fragments
         await self._emit_status(broker, "generic_device_structuring", "Understanding Generic Devices\u2026")
-        print(f"  [Pipeline] Step 2b: generic_device_structuring")
+        logger.info("[Pipeline] Step 2b: generic_device_structuring")
 
         structuring_agent = registry["generic_device_structuring"]
         structuring_result = await structuring_agent.run(
@@ -1061,12 +1466,12 @@ class Orchestrator:
 
         structured_devices = structuring_result.get("content", {}).get("generic_devices", [])
         if not structured_devices:
-            print("  [Pipeline] No structured generic devices, skipping prep steps")
+            logger.info("[Pipeline] No structured generic devices, skipping prep steps")
             return result
 
         # Step 2c: Map to DB fields + check sufficiency
         await self._emit_status(broker, "generic_prep", "Structuring Generics\u2026")
-        print(f"  [Pipeline] Step 2c: generic_prep")
+        logger.info("[Pipeline] Step 2c: generic_prep")
 
         prep_agent = registry["generic_prep"]
         prep_result = await prep_agent.run(
@@ -1085,24 +1490,29 @@ class Orchestrator:
         result["insufficient_devices"] = insufficient
 
         if not sufficient:
-            print("  [Pipeline] No generic devices with sufficient info, skipping python step")
+            logger.info("[Pipeline] No generic devices with sufficient info, skipping python step")
             return result
 
         # Step 2d: Create synthetic DB records
         # Create request-scoped database copy for synthetic injection
-        # (prevents cross-request contamination of the global DATABASE)
+        # (prevents cross-request contamination of the global DATABASE).
+        # A plain dict, not a ChainMap overlay: chain_builder scans it with
+        # .values()/.items(), which are ~15x slower through a ChainMap.
         from medsync_ai_v2.shared.device_search import get_database
         request_db = dict(get_database())
+        # Synthetic record ids are built from these (placeholder when unset)
+        uid = session_state.get("uid") or "0000"
+        session_id = session_state.get("session_id") or "0000"
 
         await self._emit_status(broker, "generic_prep_python", "Reasoning Over Generics\u2026")
-        print(f"  [Pipeline] Step 2d: generic_prep_python")
+        logger.info("[Pipeline] Step 2d: generic_prep_python")
 
         python_agent = registry["generic_prep_python"]
         python_result = await python_agent.run(
             {
                 "devices": sufficient,
-                "uid": session_state.get("uid", "0000"),
-                "session_id": session_state.get("session_id", "0000"),
+                "uid": uid,
+                "session_id": session_id,
                 "database": request_db,
             },
             session_state,
@@ -1124,11 +1534,113 @@ class Orchestrator:
 
         result["request_db"] = request_db
 
-        print(f"  [Pipeline] Generic pipeline complete: {len(result['synthetic_devices'])} synthetic, "
-              f"{len(insufficient)} insufficient")
+        logger.info(
+            "[Pipeline] Generic pipeline complete: %s synthetic, %s insufficient",
+            len(result["synthetic_devices"]), len(insufficient),
+        )
 
         return result
 
+    def _start_speculative_generic(self, registry, user_message, generic_specs, session_state) -> dict:
+        """
+        Start the generic pipeline before the intent is known. It runs with its
+        own tool_log / token_usage and a detached recorder for status events,
+        merged in by _join_speculative_generic or dropped by
+        _discard_speculative_generic.
+        """
+        recorder = RecordingBroker(None)
+        tool_log = []
+        token_usage = {"total_input_tokens": 0, "total_output_tokens": 0, "total": 0, "sub_agent_calls": []}
+        task = asyncio.create_task(self._run_generic_pipeline(
+            registry, user_message, generic_specs, {},
+            session_state, recorder, tool_log, token_usage,
+        ))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return {"task": task, "recorder": recorder, "tool_log": tool_log, "token_usage": token_usage}
+
+    async def _join_speculative_generic(self, speculative: dict, broker, tool_log, token_usage) -> dict:
+        """Adopt a speculative generic pipeline run: replay its events, merge its logs."""
+        await speculative["recorder"].attach(broker)
+        result = await speculative["task"]
+        tool_log.extend(speculative["tool_log"])
+        usage = speculative["token_usage"]
+        token_usage["total_input_tokens"] += usage["total_input_tokens"]
+        token_usage["total_output_tokens"] += usage["total_output_tokens"]
+        token_usage["total"] += usage["total"]
+        token_usage["sub_agent_calls"].extend(usage["sub_agent_calls"])
+        return result
+
+    def _discard_speculative_generic(self, speculative, token_usage: dict):
+        """Cancel an unneeded speculative generic pipeline, billing steps that finished."""
+        if speculative is None:
+            return
+        wasted = self._speculative_wasted(token_usage)
+        wasted["calls"] += 1
+        if not speculative["task"].done():
+            speculative["task"].cancel()
+            wasted["cancelled"] += 1
+        for call in speculative["token_usage"]["sub_agent_calls"]:
+            self._track_usage(token_usage, f"{call['tool']} (speculative)", {"usage": call})
+            wasted["input_tokens"] += call["input_tokens"]
+            wasted["output_tokens"] += call["output_tokens"]
+
+    async def _execute_plan(self, steps: list, execute_step):
+        """
+        Dependency-driven plan execution (Kahn's algorithm): each step starts
+        as soon as the last step it depends_on finishes, so independent
+        branches never wait for a slow sibling. Steps whose dependencies can
+        never be satisfied (cycle / unknown step_id) run sequentially as a
+        fallback. A failing step cancels the rest and re-raises.
+        """
+        waiting_on = [set(s.get("depends_on", [])) for s in steps]
+        dependents = {}
+        for i, deps in enumerate(waiting_on):
+            for dep in deps:
+                dependents.setdefault(dep, []).append(i)
+
+        done = set()
+        running = {}
+
+        def launch(i):
+            running[asyncio.ensure_future(execute_step(steps[i]))] = i
+
+        for i, deps in enumerate(waiting_on):
+            if not deps:
+                launch(i)
+        if len(running) > 1:
+            logger.info(
+                "[Pipeline] Running %s steps in parallel: %s",
+                len(running), [steps[i].get("step_id") for i in running.values()],
+            )
+
+        try:
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    i = running.pop(task)
+                    task.result()
+                    step_id = steps[i].get("step_id", "")
+                    if step_id in done:
+                        continue
+                    done.add(step_id)
+                    for child in dependents.get(step_id, ()):
+                        waiting_on[child].discard(step_id)
+                        if not waiting_on[child]:
+                            launch(child)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            raise
+
+        stuck = [i for i, deps in enumerate(waiting_on) if deps]
+        if stuck:
+            logger.warning(
+                "[Pipeline] WARNING: %s steps stuck (circular deps?), running sequentially",
+                len(stuck),
+            )
+            for i in stuck:
+                await execute_step(steps[i])
+
     # ------------------------------------------------------------------
     # General Path (greetings, scope, off-topic)
     # ------------------------------------------------------------------
@@ -1140,7 +1652,7 @@ class Orchestrator:
         """Run: general_output_agent → return."""
 
         await self._emit_status(broker, "general_output_agent", "Generating Answer\u2026")
-        print(f"  [Pipeline] Step 3: general_output_agent (no devices found)")
+        logger.info("[Pipeline] Step 3: general_output_agent (no devices found)")
 
         output_agent = registry["general_output_agent"]
         output_result = await output_agent.run(
@@ -1155,8 +1667,8 @@ class Orchestrator:
             output_content.get("raw_text", "I can help with medical device compatibility questions."),
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, None
 
@@ -1172,7 +1684,7 @@ class Orchestrator:
         """Run: vector_engine → vector_output_agent → return."""
 
         await self._emit_status(broker, "vector_engine", "Searching Documents\u2026")
-        print(f"  [Pipeline] vector_engine")
+        logger.info("[Pipeline] vector_engine")
 
         engine = registry["vector_engine"]
         engine_input = {
@@ -1182,12 +1694,14 @@ class Orchestrator:
             "classification": extraction.get("classification", {}),
             "intent": intent_data,  # Pass intent for prognosis detection & store routing
         }
-        engine_result = await engine.run(engine_input, session_state)
+        engine_result = await self._cached_engine_run(
+            "vector_engine", engine, engine_input, session_state, token_usage,
+        )
         self._track_usage(token_usage, "vector_engine", engine_result)
         tool_log.append({"step": "engine", "tool": "vector_engine"})
 
         await self._emit_status(broker, "vector_output_agent", "Generating Answer\u2026")
-        print(f"  [Pipeline] vector_output_agent")
+        logger.info("[Pipeline] vector_output_agent")
 
         output_agent = registry["vector_output_agent"]
         output_input = {
@@ -1195,8 +1709,8 @@ class Orchestrator:
             "normalized_query": normalized_query,
             "data": engine_result.get("data", {}),
             "classification": engine_result.get("classification", {}),
-            "not_found": extraction.get("not_found", []),
-            "not_found_suggestions": extraction.get("not_found_suggestions", {}),
+            "not_found": extraction.get("not_found", _EMPTY_LIST),
+            "not_found_suggestions": await self._await_suggestions(extraction),
         }
         output_result = await output_agent.run(output_input, session_state, broker=broker)
         self._track_usage(token_usage, "vector_output_agent", output_result)
@@ -1208,8 +1722,8 @@ class Orchestrator:
             output_content.get("raw_text", "Document search is not yet available."),
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, None
 
@@ -1225,7 +1739,7 @@ class Orchestrator:
         """Run: ais_clinical_engine (Router → sub-agent or Message Writer) → return."""
 
         await self._emit_status(broker, "ais_clinical_engine", "Analyzing question\u2026")
-        print(f"  [Pipeline] ais_clinical_engine")
+        logger.info("[Pipeline] ais_clinical_engine")
 
         engine = registry["ais_clinical_engine"]
         engine_input = {
@@ -1277,8 +1791,8 @@ class Orchestrator:
                 },
             })
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, None
 
@@ -1292,7 +1806,7 @@ class Orchestrator:
     ) -> tuple:
         """Stub: falls back to general output with a research note."""
 
-        print(f"  [Pipeline] Research loop not yet implemented, using general path")
+        logger.info("[Pipeline] Research loop not yet implemented, using general path")
 
         await self._emit_status(broker, "general_output_agent", "Generating Answer\u2026")
 
@@ -1315,8 +1829,8 @@ class Orchestrator:
             output_content.get("raw_text", "Deep research is not yet available."),
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, None
 
@@ -1333,8 +1847,10 @@ class Orchestrator:
         resolved_devices = list(devices.keys()) if devices else []
 
         await self._emit_status(broker, "clarification_output_agent", "Clarifying\u2026")
-        print(f"  [Pipeline] clarification_output_agent "
-              f"(not_found={not_found}, resolved={resolved_devices})")
+        logger.info(
+            "[Pipeline] clarification_output_agent (not_found=%s, resolved=%s)",
+            not_found, resolved_devices,
+        )
 
         output_agent = registry["clarification_output_agent"]
         output_input = {
@@ -1355,8 +1871,8 @@ class Orchestrator:
             "Could you clarify which devices you mean?",
         )
 
-        total = token_usage["total_input_tokens"] + token_usage["total_output_tokens"]
-        print(f"  [Pipeline] Clarification complete. {total} total tokens")
+        total = token_usage["total"]
+        logger.info("[Pipeline] Clarification complete. %s total tokens", total)
 
         return final_text, tool_log, token_usage, None
 
@@ -1369,39 +1885,18 @@ class Orchestrator:
 
         No LLM needed — the questions are pre-built by assess_completeness().
         """
-        completeness = engine_data.get("completeness", {})
-        patient = engine_data.get("patient", {})
+        completeness = engine_data.get("completeness", _EMPTY_DICT)
+        patient = engine_data.get("patient", _EMPTY_DICT)
 
         parts = []
 
         # Questions — direct, no preamble
-        questions = completeness.get("clarification_questions", [])
+        questions = completeness.get("clarification_questions", _EMPTY_LIST)
         for q in questions:
             parts.append(q)
 
         # Compact patient summary so the doctor can verify what was parsed
-        parsed_fields = []
-        if patient.get("age") is not None:
-            sex_abbr = ""
-            if patient.get("sex"):
-                sex_abbr = patient["sex"][0].upper()  # "female" → "F"
-            parsed_fields.append(f"{patient['age']}{sex_abbr}")
-        if patient.get("nihss") is not None:
-            parsed_fields.append(f"NIHSS {patient['nihss']}")
-        if patient.get("aspects") is not None:
-            parsed_fields.append(f"ASPECTS {patient['aspects']}")
-        if patient.get("last_known_well_hours") is not None:
-            parsed_fields.append(f"LKW {patient['last_known_well_hours']}h")
-        if patient.get("occlusion_location"):
-            parsed_fields.append(patient["occlusion_location"])
-        if patient.get("mrs_pre") is not None:
-            parsed_fields.append(f"mRS {patient['mrs_pre']}")
-        if patient.get("dementia"):
-            parsed_fields.append("dementia")
-        if patient.get("on_anticoagulation"):
-            parsed_fields.append(
-                f"on {patient.get('anticoagulant_type', 'anticoagulation')}"
-            )
+        parsed_fields = _patient_parts(patient, _CLINICAL_SUMMARY_FIELDS)
 
         if parsed_fields:
             parts.append(f"\n**Patient data received:** {', '.join(parsed_fields)}")
@@ -1409,7 +1904,8 @@ class Orchestrator:
         return "\n".join(parts)
 
     def _merge_clinical_followup(
-        self, pending: dict, normalized_query: str, raw_query: str
+        self, pending: dict, normalized_query: str, raw_query: str,
+        query_lower: str = None,
     ) -> str | None:
         """Merge a clinical clarification response with the original patient presentation.
 
@@ -1419,105 +1915,55 @@ class Orchestrator:
 
         Returns merged query string, or None if this doesn't look like a clinical follow-up.
         """
-        import re
-
         patient = pending.get("patient", {})
-        print(f"  [ClinicalMerge] Pending patient dict: {patient}")
-        print(f"  [ClinicalMerge] Turn 2 raw_query: {raw_query}")
+        logger.debug("[ClinicalMerge] Pending patient dict: %s", patient)
+        logger.debug("[ClinicalMerge] Turn 2 raw_query: %s", raw_query)
 
         # Check if follow-up contains clinical parameter keywords
-        query_lower = raw_query.lower()
-        clinical_keywords = {
-            "nihss", "aspects", "aspect", "lkw", "last known well",
-            "mca", "occlusion", "lvo", "mrs", "hour", "hr",
-            "wake-up", "wake up", "cta", "perfusion",
-            "m1", "m2", "m3", "ica", "basilar", "vertebral", "pca",
-            "carotid",
-            # LKW time-of-day phrases (e.g. "last normal at 10pm, found at 6am")
-            "last normal", "found at", "went to bed", "woke up", "bedtime",
-            "normal at", "last seen normal", "last seen well",
-        }
-        has_clinical_content = any(kw in query_lower for kw in clinical_keywords)
-        # Also match bare time patterns: "10pm", "6am", "22:00", "06:00"
-        if not has_clinical_content:
-            has_clinical_content = bool(re.search(r'\b\d{1,2}(?:am|pm|:\d{2})\b', query_lower))
+        if query_lower is None:
+            query_lower = raw_query.lower()
+        has_clinical_content = bool(
+            _CLINICAL_KEYWORDS_RE.search(query_lower)
+            # Also match bare time patterns: "10pm", "6am", "22:00", "06:00"
+            or _BARE_TIME_RE.search(query_lower)
+        )
 
         # Detect "I don't have it" responses
-        unavailable_keywords = [
-            "don't have", "do not have", "not available", "unavailable",
-            "unknown", "can't provide", "cannot provide", "not done",
-            "no cta", "no imaging", "no aspects", "no perfusion",
-            "not performed", "wasn't done", "didn't do", "no access to",
-            # "I don't know" variants
-            "don't know", "do not know", "not sure", "unsure", "no idea",
-            "not known", "couldn't tell", "can't tell",
-        ]
-        user_cant_provide = any(kw in query_lower for kw in unavailable_keywords)
+        user_cant_provide = bool(_UNAVAILABLE_RE.search(query_lower))
 
         if user_cant_provide:
-            print(f"  [ClinicalMerge] User indicates data unavailable - will use conditional frameworks")
+            logger.debug("[ClinicalMerge] User indicates data unavailable - will use conditional frameworks")
             return "__UNAVAILABLE__"  # Special marker for orchestrator
 
         # Also check for bare numeric patterns common in clinical follow-ups
         # e.g., "15, 9, 3 hours" — terse responses to clarification questions
-        has_numeric_clinical = bool(re.search(r'\d+\s*[,;]\s*\d+', raw_query))
+        has_numeric_clinical = bool(_NUMERIC_CLINICAL_RE.search(raw_query))
 
         if not has_clinical_content and not has_numeric_clinical:
-            print(f"  [ClinicalMerge] No clinical content detected, returning None (topic change)")
+            logger.debug("[ClinicalMerge] No clinical content detected, returning None (topic change)")
             return None
 
         # Reconstruct what we already know from Turn 1 patient dict
-        known_parts = []
-        if patient.get("age"):
-            sex = patient.get("sex", "")
-            known_parts.append(f"{patient['age']}yo {sex}".strip())
-        if patient.get("occlusion_location"):
-            known_parts.append(f"{patient['occlusion_location']} occlusion")
-        elif patient.get("occlusion_segment") and patient.get("occlusion_segment") != "unspecified":
-            seg = patient["occlusion_segment"]
-            seg_label = {
-                "M1": "M1",
-                "M2_dominant": "dominant M2",
-                "M2_nondominant": "nondominant M2",
-            }.get(seg, seg)
-            known_parts.append(f"{seg_label} occlusion")
-        elif patient.get("lvo"):
-            known_parts.append("LVO confirmed")
-        if patient.get("wake_up_stroke"):
-            known_parts.append("wake-up stroke")
-        elif patient.get("unknown_onset"):
-            known_parts.append("unknown onset")
-        if patient.get("last_known_well_hours") is not None:
-            known_parts.append(f"LKW {patient['last_known_well_hours']}h")
-        if patient.get("nihss") is not None:
-            known_parts.append(f"NIHSS {patient['nihss']}")
-        if patient.get("aspects") is not None:
-            known_parts.append(f"ASPECTS {patient['aspects']}")
-        if patient.get("mrs_pre") is not None:
-            known_parts.append(f"mRS {patient['mrs_pre']}")
-        if patient.get("on_anticoagulation"):
-            known_parts.append(f"on {patient.get('anticoagulant_type', 'anticoagulation')}")
-        if patient.get("has_perfusion_imaging"):
-            known_parts.append("perfusion imaging available")
+        known_parts = _patient_parts(patient, _KNOWN_PATIENT_FIELDS)
 
         # Add M2 dominance status from Turn 2
-        if "dominant" in raw_query.lower() and "m2" in raw_query.lower():
-            if "nondominant" in raw_query.lower() or "non-dominant" in raw_query.lower():
+        if "dominant" in query_lower and "m2" in query_lower:
+            if "nondominant" in query_lower or "non-dominant" in query_lower:
                 known_parts.append("M2 nondominant branch")
             else:
                 known_parts.append("M2 dominant branch")
 
         # Add age from Turn 2 numeric patterns
-        age_match = re.search(r'\b(\d{1,3})\s*(?:years?\s*old|yo|y/o)\b', raw_query, re.IGNORECASE)
+        age_match = _AGE_RE.search(raw_query)
         if not age_match:
-            age_match = re.search(r'\b(\d{1,3})[MF]\b', raw_query)  # Compact notation
+            age_match = _AGE_COMPACT_RE.search(raw_query)  # Compact notation
         if age_match:
             known_parts.append(f"age {age_match.group(1)}")
 
         # Add perfusion imaging status from Turn 2
-        if any(kw in query_lower for kw in ["ctp done", "perfusion done", "dwi-flair", "has ctp"]):
+        if _PERFUSION_DONE_RE.search(query_lower):
             known_parts.append("perfusion imaging available")
-        elif any(kw in query_lower for kw in ["no ctp", "no perfusion", "perfusion not done"]):
+        elif _PERFUSION_NOT_DONE_RE.search(query_lower):
             known_parts.append("no perfusion imaging")
 
         # Combine: Turn 1 known data + Turn 2 new data (raw_query, not normalized)
@@ -1527,75 +1973,44 @@ class Orchestrator:
         else:
             merged = raw_query
 
-        print(f"  [ClinicalMerge] Known parts: {known_parts}")
-        print(f"  [ClinicalMerge] Final merged: {merged}")
+        logger.debug("[ClinicalMerge] Known parts: %s", known_parts)
+        logger.debug("[ClinicalMerge] Final merged: %s", merged)
         return merged
 
     def _enrich_guideline_query(
-        self, normalized_query: str, raw_query: str, clinical_context: dict
+        self, normalized_query: str, raw_query: str, clinical_context: dict,
+        query_lower: str = None,
     ) -> str | None:
         """Enrich a guideline question with clinical context from previous assessment.
 
         Returns enriched query string, or None if this isn't a guideline follow-up.
         """
-        query_lower = raw_query.lower()
+        if query_lower is None:
+            query_lower = raw_query.lower()
 
         # Must look like a guideline/evidence question
-        guideline_keywords = [
-            "guideline", "evidence", "trial", "study", "data",
-            "cor ", "loe ", "class of recommendation", "level of evidence",
-            "what did", "what does", "what about", "tell me more",
-            "show me", "explain", "can you elaborate",
-            "subgroup", "analysis", "outcome", "result",
-            "hermes", "dawn", "defuse", "select2", "angel", "tension",
-            "trace", "timeless", "ninds", "ecass", "escape", "revascat",
-            "enchanted", "baoche", "attention", "basics",
-            "wake-up", "extend", "rescue",
-        ]
-        has_guideline_intent = any(kw in query_lower for kw in guideline_keywords)
-
-        if not has_guideline_intent:
+        if not _GUIDELINE_INTENT_RE.search(query_lower):
             return None
 
         # Must NOT have patient parameters (that would be Scenario A or C)
-        patient_keywords = [
-            "nihss", "aspects", "lkw", "last known well",
-            "year-old", "yo ", "occlusion", "cta shows",
-        ]
-        if any(kw in query_lower for kw in patient_keywords):
+        if _GUIDELINE_PATIENT_RE.search(query_lower):
             return None
 
         # Must NOT have device intent (that would be Scenario B)
-        device_keywords = [
-            "device", "catheter", "microcatheter", "stent retriever",
-            "configuration", "compatible", "vecta", "headway", "solitaire",
-        ]
-        if any(kw in query_lower for kw in device_keywords):
+        if _GUIDELINE_DEVICE_RE.search(query_lower):
             return None
 
         # Build enrichment context from previous assessment
         patient = clinical_context.get("patient", {})
         eligibility = clinical_context.get("eligibility", [])
 
-        context_parts = []
-
-        if patient.get("mrs_pre") is not None:
-            context_parts.append(f"pre-stroke mRS {patient['mrs_pre']}")
-        if patient.get("last_known_well_hours") is not None:
-            context_parts.append(f"LKW {patient['last_known_well_hours']}h")
-        if patient.get("aspects") is not None:
-            context_parts.append(f"ASPECTS {patient['aspects']}")
-        if patient.get("occlusion_location"):
-            context_parts.append(f"{patient['occlusion_location']} occlusion")
-        if patient.get("age"):
-            context_parts.append(f"age {patient['age']}")
+        context_parts = _patient_parts(patient, _GUIDELINE_CONTEXT_FIELDS)
 
         # Add uncertain/conditional pathways
-        uncertain_paths = []
-        for e in eligibility:
-            elig = e.get("eligibility", "")
-            if elig in ("UNCERTAIN", "CONDITIONAL"):
-                uncertain_paths.append(e.get("treatment", ""))
+        uncertain_paths = [
+            e.get("treatment", "") for e in eligibility
+            if e.get("eligibility", "") in _FLAGGED_ELIGIBILITY
+        ]
         if uncertain_paths:
             context_parts.append(f"pathways flagged: {', '.join(uncertain_paths)}")
 
@@ -1604,23 +2019,200 @@ class Orchestrator:
 
         context_str = "; ".join(context_parts)
         enriched = f"{raw_query} [Clinical context: {context_str}]"
-        print(f"  [GuidelineEnrich] Enriched query: {enriched[:200]}")
+        logger.debug("[GuidelineEnrich] Enriched query: %s", enriched[:200])
         return enriched
 
+    async def _await_suggestions(self, extraction: dict) -> dict:
+        """Resolve the deferred fuzzy-suggestion task (see run) into extraction."""
+        task = extraction.pop("_suggestions_task", None)
+        if task is not None:
+            extraction["not_found_suggestions"] = await task
+        return extraction.get("not_found_suggestions", _EMPTY_DICT)
+
     def _get_fuzzy_suggestions(self, not_found: list) -> dict:
         """Get fuzzy match suggestions for each unresolved device name."""
-        from medsync_ai_v2.shared.device_search import DeviceSearchHelper
-        helper = DeviceSearchHelper()
+        epoch = get_catalog_epoch()
+        debug = logger.isEnabledFor(logging.DEBUG)
         suggestions = {}
         for name in not_found:
-            matches = helper.suggest_close_matches(name, max_suggestions=3)
+            # Callers own their suggestion dicts; the cached ones stay shared
+            matches = [dict(m) for m in _close_matches(name.lower(), 3, epoch)]
             suggestions[name] = matches
-            if matches:
-                print(f"    Suggestions for '{name}': {[m['product_name'] for m in matches]}")
-            else:
-                print(f"    No suggestions for '{name}'")
+            if debug and matches:
+                logger.debug("  Suggestions for '%s': %s", name, [m["product_name"] for m in matches])
+            elif debug:
+                logger.debug("  No suggestions for '%s'", name)
         return suggestions
 
+    async def _coalesced(self, agent, input_data: dict, session_state: dict) -> dict:
+        """
+        agent.run memoized on its input (per device catalog epoch) for
+        AGENT_CACHE_TTL_S and shared with concurrent sessions sending the
+        same input. Only for agents whose output ignores session_state
+        (intent classifier, equipment extraction). Degraded results (parse
+        or validation failures, fallbacks) are not cached.
+        """
+        key = (agent.name, orjson.dumps(input_data, option=orjson.OPT_SORT_KEYS, default=str), get_catalog_epoch())
+        cached = self._agent_cache.get(key)
+        if cached is not None:
+            logger.info("[Pipeline] %s result cache hit", agent.name)
+            return cached
+        result = await coalesce(key, lambda: agent.run(input_data, session_state))
+        if not result.get("degraded") and not result.get("fallback"):
+            self._agent_cache.put(key, result)
+        return result
+
+    async def _cached_engine_run(self, name: str, engine, engine_input: dict, session_state: dict, token_usage: dict) -> dict:
+        """
+        engine.run memoized on its input for ENGINE_CACHE_TTL_S (engines
+        that ignore session_state only). Concurrent identical calls (sibling
+        plan steps, other sessions) share one run. Error results are not
+        cached; hits/misses are counted in token_usage["cache_stats"].
+        """
+        key = (name, orjson.dumps(engine_input, option=orjson.OPT_SORT_KEYS, default=str))
+        stats = token_usage.setdefault("cache_stats", {}).setdefault(name, {"hits": 0, "misses": 0})
+        cached = self._engine_cache.get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            logger.info("[Pipeline] %s result cache hit", name)
+            return cached
+        stats["misses"] += 1
+        result = await coalesce(key, lambda: engine.run(engine_input, session_state))
+        if result.get("status") != "error":
+            self._engine_cache.put(key, result)
+        return result
+
+    def _timeout_ms(self, tool_name: str):
+        """Fixed timeout from config, else adaptive from the latency window, else None."""
+        fixed = SUB_AGENT_TIMEOUTS_MS.get(tool_name)
+        if fixed:
+            return fixed
+        window = self._latency_ms.get(tool_name)
+        if not window or len(window) < LATENCY_MIN_SAMPLES:
+            return None
+        p95 = sorted(window)[int(0.95 * (len(window) - 1))]
+        return max(p95 * ADAPTIVE_TIMEOUT_MULTIPLIER, ADAPTIVE_TIMEOUT_FLOOR_MS)
+
+    async def _bounded(self, tool_name: str, call) -> dict:
+        """
+        Await a sub-agent call under its timeout and circuit breaker; on
+        timeout, or while the breaker is open, return the deterministic
+        fallback (marked "fallback": "timeout" / "circuit_open").
+        Only completed model calls started here feed the latency window, so
+        timeouts, cache hits and reused speculative tasks can't ratchet the
+        adaptive bound down.
+        """
+        breaker = self._breakers[tool_name]
+        if not breaker.allow():
+            # call is an un-awaited coroutine or a speculative task
+            if isinstance(call, asyncio.Future):
+                call.cancel()
+            else:
+                call.close()
+            logger.warning(
+                "[Pipeline] %s circuit open, using fallback (%s rejected)",
+                tool_name, breaker.rejected,
+            )
+            return self._fallback_result(tool_name, "circuit_open")
+
+        # A speculative task may already be done: waiting on it isn't a call
+        started_here = not isinstance(call, asyncio.Future)
+        timeout_ms = self._timeout_ms(tool_name)
+        start = time.monotonic()
+        try:
+            if timeout_ms is None:
+                result = await call
+            else:
+                result = await asyncio.wait_for(call, timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            logger.warning("[Pipeline] %s timed out after %.0fms, using fallback", tool_name, timeout_ms)
+            return self._fallback_result(tool_name, "timeout")
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        # Cache hits, coalesced joins and local-model classifications spend
+        # no tokens and return in ~0ms; they say nothing about model latency
+        usage = result.get("usage") or _EMPTY_DICT
+        if started_here and (usage.get("input_tokens") or usage.get("output_tokens")):
+            self._latency_ms[tool_name].append((time.monotonic() - start) * 1000)
+        return result
+
+    @staticmethod
+    def _fallback_result(tool_name: str, reason: str) -> dict:
+        return {
+            "content": copy.deepcopy(SUB_AGENT_FALLBACKS[tool_name]),
+            "usage": {"input_tokens": 0, "output_tokens": 0},
+            "fallback": reason,
+        }
+
+    @staticmethod
+    def _log_entry(step, tool_name: str, result: dict) -> dict:
+        entry = {"step": step, "tool": tool_name}
+        if result.get("fallback"):
+            # Downstream routing can demote confidence on fallback results
+            entry["fallback"] = result["fallback"]
+        return entry
+
+    async def _speculative_intent(self, classifier, user_message: str, session_state: dict) -> dict:
+        """Intent classification on the raw query, tagged so the result shows it was speculative."""
+        result = await self._coalesced(classifier, {"normalized_query": user_message}, session_state)
+        content = result.get("content")
+        if isinstance(content, dict):
+            # Classified before rewriting — the caller decides whether to keep it
+            content["speculative"] = True
+        return result
+
+    def _speculation_holds(self, user_message: str, normalized_query: str) -> bool:
+        """True if results computed on the raw query still apply to the normalized one."""
+        # Any other edit may be the rewriter resolving "it" to a device or
+        # changing a size, which the raw-query results would miss
+        if normalized_query == user_message:
+            return True
+        return " ".join(normalized_query.lower().split()) == " ".join(user_message.lower().split())
+
+    @staticmethod
+    def _is_general_intent(intent_task) -> bool:
+        """True if a finished intent task classified the query as plain "general"."""
+        if not intent_task.done() or intent_task.cancelled() or intent_task.exception():
+            return False
+        result = intent_task.result()
+        if result.get("fallback"):
+            # Degraded classification: let extraction inform routing
+            return False
+        content = result.get("content", {})
+        intents = content.get("intents", [])
+        return bool(intents) and intents[0].get("type") == "general" and not content.get("needs_planning")
+
+    @staticmethod
+    def _speculative_wasted(token_usage: dict) -> dict:
+        return token_usage.setdefault(
+            "speculative_wasted", {"calls": 0, "cancelled": 0, "input_tokens": 0, "output_tokens": 0}
+        )
+
+    def _discard_speculative(self, task, token_usage: dict, tool_name: str):
+        """
+        Drop an unused speculative agent call, still billing it if it finished.
+        Wasted speculation is also summarized in token_usage["speculative_wasted"].
+        """
+        if task is None:
+            return
+        wasted = self._speculative_wasted(token_usage)
+        wasted["calls"] += 1
+        if not task.done():
+            task.cancel()
+            wasted["cancelled"] += 1
+        elif not task.cancelled() and task.exception() is None:
+            result = task.result()
+            self._track_usage(token_usage, f"{tool_name} (speculative)", result)
+            usage = result.get("usage", {})
+            wasted["input_tokens"] += usage.get("input_tokens", 0)
+            wasted["output_tokens"] += usage.get("output_tokens", 0)
+
     async def _emit_status(self, broker, agent_name: str, content: str):
         """Emit a status event through the broker."""
         if broker is None:
@@ -1641,8 +2233,26 @@ class Orchestrator:
         out = usage.get("output_tokens", 0)
         token_usage["total_input_tokens"] += inp
         token_usage["total_output_tokens"] += out
-        token_usage["sub_agent_calls"].append({
+        token_usage["total"] += inp + out
+        call = {
             "tool": tool_name,
             "input_tokens": inp,
             "output_tokens": out,
-        })
+        }
+        cache_read = usage.get("cache_read_input_tokens", 0)
+        cache_write = usage.get("cache_creation_input_tokens", 0)
+        if cache_read or cache_write:
+            # Anthropic prompt cache: billed at different rates from input
+            # tokens, so kept out of the input/total counts
+            call["cache_read_input_tokens"] = cache_read
+            call["cache_creation_input_tokens"] = cache_write
+            cached = token_usage.setdefault(
+                "prompt_cache", {"cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+            )
+            cached["cache_read_input_tokens"] += cache_read
+            cached["cache_creation_input_tokens"] += cache_write
+        token_usage["sub_agent_calls"].append(call)
+
+
+if config.EAGER_REGISTRY:
+    _get_tool_registry()
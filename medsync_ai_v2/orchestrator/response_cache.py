@@ -0,0 +1,177 @@
+"""
+Orchestrator - Exact-Match Response Cache
+
+Short-lived cache of complete orchestrator results, keyed on the session
+(uid, session_id), the user message and the context that can change its
+answer. Serves retries, reloads and duplicate SSE reconnects without
+re-running the LLM pipeline.
+
+Each entry stores the broker events the original run emitted (status,
+final_chunk, redirects, ...) so a hit replays the same stream to the client.
+
+AgentResultCache memoizes individual sub-agent and engine runs (intent
+classifier, equipment extraction, vector search) whose output depends only
+on their input.
+"""
+
+import copy
+import time
+import hashlib
+from collections import OrderedDict
+
+import orjson
+
+from medsync_ai_v2.shared.session_state import RECENT_TURNS_MAX
+
+RESPONSE_CACHE_MAXSIZE = 2048
+RESPONSE_CACHE_TTL_S = 300
+
+AGENT_CACHE_MAXSIZE = 1024
+AGENT_CACHE_TTL_S = 600
+
+# Vector engine results (document search) keyed on the engine input
+ENGINE_CACHE_MAXSIZE = 2000
+ENGINE_CACHE_TTL_S = 300
+
+# Session keys that change how a message is answered
+CONTEXT_KEYS = (
+    "pending_clinical_clarification",
+    "last_clinical_assessment",
+    "clinical_data_unavailable",
+    "generic_insufficient",
+)
+
+
+def _prior_turns(session_state: dict, user_message: str) -> list:
+    """
+    Conversation context preceding user_message.
+
+    Drops the current message and any earlier ask/answer pairs of the same
+    message at the tail, so a retry sees the same context as the first ask.
+    """
+    turns = [
+        {"role": m["role"], "content": m["content"]}
+        for m in session_state.get("conversation_history", [])
+        if m.get("role") in ("user", "assistant")
+    ]
+    while turns:
+        last = turns[-1]
+        if last["role"] == "user" and last["content"] == user_message:
+            turns.pop()
+        elif (last["role"] == "assistant" and len(turns) >= 2
+              and turns[-2]["role"] == "user" and turns[-2]["content"] == user_message):
+            del turns[-2:]
+        else:
+            break
+    # Same window the InputRewriter sees (minus the current message)
+    return turns[-(RECENT_TURNS_MAX - 1):]
+
+
+def cache_key(user_message: str, session_state: dict) -> str:
+    # Scoped to the session: replayed events, chain_data and synthetic ids
+    # belong to the session that produced them
+    payload = orjson.dumps(
+        [
+            session_state.get("uid"),
+            session_state.get("session_id"),
+            user_message,
+            _prior_turns(session_state, user_message),
+            [session_state.get(k) for k in CONTEXT_KEYS],
+        ],
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def context_snapshot(session_state: dict) -> bytes:
+    """Serialized CONTEXT_KEYS, to detect runs that changed session state."""
+    return orjson.dumps([session_state.get(k) for k in CONTEXT_KEYS], option=orjson.OPT_SORT_KEYS, default=str)
+
+
+class RecordingBroker:
+    """Forwards events to the real broker and keeps a copy for the cache."""
+
+    def __init__(self, broker):
+        self._broker = broker
+        self.events = []
+
+    async def put(self, item: dict):
+        self.events.append(_copy_event(item))
+        if self._broker is not None:
+            await self._broker.put(item)
+
+    async def attach(self, broker):
+        """Replay what was recorded so far to broker, then forward live."""
+        replayed = 0
+        while replayed < len(self.events):
+            if broker is not None:
+                await broker.put(_copy_event(self.events[replayed]))
+            replayed += 1
+        self._broker = broker
+
+    def __getattr__(self, name):
+        return getattr(self._broker, name)
+
+
+def _copy_event(event: dict) -> dict:
+    # Consumers annotate event["data"] in place (uid/session_id), so copy one level
+    return {**event, "data": dict(event.get("data") or {})}
+
+
+class ResponseCache:
+    """TTL + LRU map of cache_key -> (result tuple, broker events)."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_MAXSIZE, ttl: float = RESPONSE_CACHE_TTL_S):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, result, events = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result, [_copy_event(e) for e in events]
+
+    def put(self, key: str, result: tuple, events: list):
+        self._entries[key] = (time.monotonic() + self.ttl, result, events)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class AgentResultCache:
+    """
+    LRU map of (agent name, input, ...) -> agent result, with optional TTL.
+
+    Results are copied in and out (callers mutate them); hits carry zero
+    usage, since no tokens were spent.
+    """
+
+    def __init__(self, maxsize: int = AGENT_CACHE_MAXSIZE, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires is not None and expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return {**copy.deepcopy(result), "usage": {"input_tokens": 0, "output_tokens": 0}}
+
+    def put(self, key, result: dict):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
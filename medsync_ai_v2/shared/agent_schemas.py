@@ -0,0 +1,115 @@
+"""
+MedSync AI v2 - Agent Output Schemas
+
+Typed pydantic models for the JSON returned by LLM sub-agents. Validators are
+compiled once per model by pydantic-core, so a single validate call replaces
+json.loads + chains of defensive .get() lookups and coerces loose LLM output
+("true" -> True, "0.9" -> 0.9) into the documented shapes.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+import orjson
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+class _AgentOutput(BaseModel):
+    """Base for agent outputs — unknown keys are kept, not dropped."""
+    model_config = ConfigDict(extra="allow")
+
+
+class RewriterOut(_AgentOutput):
+    """input_rewriter output."""
+    rewritten_user_prompt: Optional[str] = None
+    source_filter: List[str] = []
+
+
+class Intent(_AgentOutput):
+    """Single classified intent."""
+    type: str
+    confidence: float = 0.0
+
+
+class IntentOut(_AgentOutput):
+    """intent_classifier output."""
+    intents: List[Intent] = []
+    is_multi_intent: bool = False
+    needs_planning: bool = False
+    hybrid_mode: Optional[str] = None
+    rationale: str = ""
+
+
+class GenericPrepDevice(_AgentOutput):
+    """Single generic_prep device evaluation."""
+    raw: str = ""
+    has_info: bool = False
+    device_type: Optional[str] = None
+    search_criteria: Optional[Dict[str, Any]] = None
+    reason: Optional[str] = None
+
+
+class GenericPrepOut(_AgentOutput):
+    """generic_prep output."""
+    devices: List[GenericPrepDevice] = []
+
+
+def validate_output(schema: Type[_AgentOutput], content, issues: list = None) -> dict:
+    """
+    Validate raw LLM content (dict or JSON string) against an output schema.
+
+    Invalid list items (e.g. one malformed intent) and invalid fields are
+    dropped and the rest is kept; schema defaults are used only when the
+    content is not a JSON object at all.
+
+    Args:
+        issues: optional list; a description of each problem found is appended
+
+    Returns:
+        The validated content as a plain dict in the documented shape.
+    """
+    data = content
+    if isinstance(content, (str, bytes)):
+        try:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            data = None
+    if not data:
+        data = {}
+    if not isinstance(data, dict):
+        _report(schema, issues, f"expected a JSON object, got {type(data).__name__}")
+        return schema().model_dump(exclude_none=True)
+
+    try:
+        model = schema.model_validate(data)
+    except ValidationError as e:
+        data = dict(data)
+        bad_items = {}
+        bad_fields = set()
+        for error in e.errors():
+            loc = error["loc"]
+            if len(loc) >= 2 and isinstance(loc[1], int) and isinstance(data.get(loc[0]), list):
+                bad_items.setdefault(loc[0], set()).add(loc[1])
+            elif loc:
+                bad_fields.add(loc[0])
+        for field, indices in bad_items.items():
+            if field not in bad_fields:
+                data[field] = [item for i, item in enumerate(data[field]) if i not in indices]
+        for field in bad_fields:
+            data.pop(field, None)
+        dropped = [f"{field}[{i}]" for field, indices in bad_items.items() for i in sorted(indices)]
+        _report(schema, issues, f"dropped {', '.join(dropped + sorted(map(str, bad_fields)))}")
+        try:
+            model = schema.model_validate(data)
+        except ValidationError as e:
+            _report(schema, issues, f"{e.error_count()} error(s) after repair")
+            model = schema()
+    return model.model_dump(exclude_none=True)
+
+
+def _report(schema: Type[_AgentOutput], issues: list, problem: str):
+    logger.warning("[AgentSchemas] %s validation: %s", schema.__name__, problem)
+    if issues is not None:
+        issues.append(problem)
@@ -0,0 +1,66 @@
+"""
+MedSync AI v2 - Circuit Breaker
+
+Per-dependency breaker: after fail_threshold failures (errors or timeouts)
+within window seconds it opens, and callers skip the dependency for cooldown
+seconds instead of each paying the full timeout. After the cooldown one trial
+call is let through (half-open); success closes the breaker, failure re-opens
+it.
+"""
+
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+
+    def __init__(self, name: str, fail_threshold: int = 5, window: float = 30, cooldown: float = 30):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._failures = deque()
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """True if a call may proceed (closed, or the half-open trial call)."""
+        if self._opened_at is None:
+            return True
+        if time.monotonic() - self._opened_at >= self.cooldown and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self._failures.clear()
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        now = time.monotonic()
+        if self._trial_in_flight:
+            # Half-open trial failed: stay open for another cooldown
+            self._trial_in_flight = False
+            self._opened_at = now
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window:
+            self._failures.popleft()
+        if len(self._failures) >= self.fail_threshold and self._opened_at is None:
+            self._opened_at = now
+            logger.warning("[CircuitBreaker] %s opened after %s failures in %.0fs (cooldown %.0fs)",
+                           self.name, len(self._failures), self.window, self.cooldown)
+
+    def record_cancelled(self):
+        """A trial call was cancelled without an outcome: allow another trial."""
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
@@ -0,0 +1,56 @@
+"""
+MedSync AI v2 - Request Coalescer
+
+Process-wide in-flight deduplication of whole agent runs. Concurrent
+sessions asking the same thing (same agent, same normalized query) share one
+run — local model, LLM call and DB resolution — and every caller gets its own
+copy of the result. Only the first caller to receive it is billed; the
+others see zero usage.
+
+Only coalesce agents whose output depends on the key alone (not on
+session_state).
+"""
+
+import copy
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+_inflight = {}
+
+
+async def coalesce(key, factory):
+    """
+    Run factory() once per key among concurrent callers.
+
+    factory: zero-arg callable returning an awaitable agent result
+             ({"content", "usage", ...}).
+    The shared run is cancelled only once every caller has given up.
+    """
+    entry = _inflight.get(key)
+    if entry is None:
+        task = asyncio.ensure_future(factory())
+        entry = _inflight[key] = {"task": task, "waiters": 0, "billed": False}
+        task.add_done_callback(
+            lambda _t, k=key, e=entry: _inflight.pop(k) if _inflight.get(k) is e else None
+        )
+
+    entry["waiters"] += 1
+    try:
+        result = await asyncio.shield(entry["task"])
+    finally:
+        entry["waiters"] -= 1
+        if not entry["waiters"] and not entry["task"].done():
+            entry["task"].cancel()
+
+    if entry["billed"]:
+        logger.debug("[Coalescer] Joined in-flight %s run", key[0])
+        return {**copy.deepcopy(result), "usage": {"input_tokens": 0, "output_tokens": 0}}
+    # First caller to receive the result carries its usage (even if the
+    # caller that started the run was cancelled)
+    entry["billed"] = True
+    if entry["waiters"]:
+        # Callers mutate their result (devices.update, ...) — copy while shared
+        return copy.deepcopy(result)
+    return result
@@ -12,7 +12,6 @@ Ported from vs2/agents/get_databases.py, vs2/agents/search.py, vs2/utils/device_
 
 import os
 import json
-import difflib
 import firebase_admin
 from firebase_admin import credentials, firestore
 from typing import Optional, Dict, List, Union
@@ -24,6 +23,7 @@ from whoosh.fields import Schema, TEXT, ID
 from whoosh.filedb.filestore import RamStorage
 from whoosh.analysis import RegexTokenizer, LowercaseFilter
 from whoosh.query import Or, And, Term, Phrase, FuzzyTerm
+from rapidfuzz import fuzz, process as rf_process
 
 from medsync_ai_v2 import config
 
@@ -178,6 +178,10 @@ class FirebaseDB:
 _DATABASE = None
 _TEXT_SEARCH = None
 _WHOOSH_INDEX = None
+_PRODUCT_CATALOG = None
+# Bumped whenever the device database or search index is (re)loaded, so
+# caches of device-resolution results can key on it
+_CATALOG_EPOCH = 0
 
 
 def load_text_search() -> list:
@@ -201,14 +205,40 @@ def load_device_database() -> dict:
 
 
 def get_database() -> dict:
-    global _DATABASE
+    global _DATABASE, _CATALOG_EPOCH
     if _DATABASE is None:
         print("Loading device database from Firebase...")
         _DATABASE = load_device_database()
+        _CATALOG_EPOCH += 1
         print(f"Loaded {len(_DATABASE)} devices.")
     return _DATABASE
 
 
+def get_catalog_epoch() -> int:
+    return _CATALOG_EPOCH
+
+
+def get_product_catalog() -> tuple:
+    """
+    Product-name catalog for fuzzy matching, built once per loaded DATABASE.
+
+    Returns:
+        (lowercased names, lowercase -> original name, original name -> first device_name)
+    """
+    global _PRODUCT_CATALOG
+    database = get_database()
+    if _PRODUCT_CATALOG is None or _PRODUCT_CATALOG[0] is not database:
+        lower_to_original = {}
+        device_names = {}
+        for v in database.values():
+            name = v.get("product_name")
+            if name:
+                lower_to_original.setdefault(name.lower(), name)
+                device_names.setdefault(name, v.get("device_name", ""))
+        _PRODUCT_CATALOG = (database, (list(lower_to_original), lower_to_original, device_names))
+    return _PRODUCT_CATALOG[1]
+
+
 def get_text_search() -> list:
     global _TEXT_SEARCH
     if _TEXT_SEARCH is None:
@@ -234,7 +264,7 @@ schema = Schema(
 
 
 def build_whoosh_index():
-    global _WHOOSH_INDEX
+    global _WHOOSH_INDEX, _CATALOG_EPOCH
     text_search = get_text_search()
 
     storage = RamStorage()
@@ -252,6 +282,7 @@ def build_whoosh_index():
 
     writer.commit()
     _WHOOSH_INDEX = ix
+    _CATALOG_EPOCH += 1
     print(f"Built Whoosh index with {len(text_search)} documents.")
     return ix
 
@@ -311,8 +342,8 @@ class DeviceSearchHelper:
         """
         Find close matches for an unresolved device name.
 
-        Uses Whoosh FuzzyTerm (edit distance) then difflib fallback against
-        all product_name values in DATABASE.
+        Uses Whoosh FuzzyTerm (edit distance) then a rapidfuzz similarity
+        fallback against all product_name values in DATABASE.
 
         Returns list of dicts sorted by score descending:
             [{"product_name": str, "device_name": str, "score": float}, ...]
@@ -346,40 +377,23 @@ class DeviceSearchHelper:
             except Exception as e:
                 print(f"  [DeviceSearch] FuzzyTerm error for '{device_name}': {e}")
 
-        # ── Tier 2: difflib fallback ──────────────────────────
-        database = get_database()
-        all_product_names = list({
-            v.get("product_name", "")
-            for v in database.values()
-            if v.get("product_name")
-        })
-
-        lower_to_original = {}
-        for name in all_product_names:
-            lower_to_original.setdefault(name.lower(), name)
-
-        close = difflib.get_close_matches(
+        # ── Tier 2: rapidfuzz fallback ────────────────────────
+        lower_names, lower_to_original, device_names = get_product_catalog()
+        close = rf_process.extract(
             device_name.lower(),
-            [n.lower() for n in all_product_names],
-            n=max_suggestions,
-            cutoff=0.5,
+            lower_names,
+            scorer=fuzz.ratio,
+            limit=max_suggestions,
+            score_cutoff=50,
         )
 
-        for match_lower in close:
-            original = lower_to_original.get(match_lower, match_lower)
+        for match_lower, score, _ in close:
+            original = lower_to_original[match_lower]
             if original not in suggestions:
-                dev_name = ""
-                for v in database.values():
-                    if v.get("product_name") == original:
-                        dev_name = v.get("device_name", "")
-                        break
-                ratio = difflib.SequenceMatcher(
-                    None, device_name.lower(), match_lower
-                ).ratio()
                 suggestions[original] = {
                     "product_name": original,
-                    "device_name": dev_name,
-                    "score": round(ratio, 2),
+                    "device_name": device_names.get(original, ""),
+                    "score": round(score / 100.0, 2),
                 }
 
         # Sort by score descending, limit
@@ -0,0 +1,31 @@
+"""
+MedSync AI v2 - Local Sentence Embeddings
+
+One shared SentenceTransformer per model name, loaded on first use. Used by
+the IntentClassifier's embedding model and the InputRewriter's semantic cache.
+sentence_transformers is imported lazily (heavy: torch).
+"""
+
+import threading
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_sentence_encoder(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """Load the encoder once (thread-safe; call via asyncio.to_thread)."""
+    encoder = _encoders.get(model_name)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(model_name)
+            if encoder is None:
+                from sentence_transformers import SentenceTransformer
+                encoder = _encoders[model_name] = SentenceTransformer(model_name)
+    return encoder
+
+
+def embed(texts: list, model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """L2-normalized embeddings (numpy array, one row per text)."""
+    return get_sentence_encoder(model_name).encode(texts, normalize_embeddings=True)
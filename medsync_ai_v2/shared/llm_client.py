@@ -4,10 +4,37 @@ Async provider abstraction layer supporting OpenAI and Anthropic.
 Ported from v1/llm/client.py with additions for JSON mode.
 """
 
-import json
 import os
+import copy
+import json
+import asyncio
+import hashlib
+import httpx
+import orjson
 from medsync_ai_v2 import config
 
+# One keep-alive HTTP/2 connection pool shared by every provider SDK client
+_http_client: httpx.AsyncClient = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared connection pool (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def _llm_debug_enabled():
     return os.getenv("LLM_DEBUG", "").lower() in ("1", "true", "yes")
 
@@ -17,13 +44,15 @@ class LLMClient:
     def __init__(self, provider: str = "openai", model: str = "gpt-4.1"):
         self.provider = provider
         self.model = model
+        # In-flight call_json requests: request hash -> {"task", "waiters"}
+        self._inflight = {}
 
         if provider == "openai":
             from openai import AsyncOpenAI
-            self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_get_http_client())
         elif provider == "anthropic":
             import anthropic
-            self.client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            self.client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=_get_http_client())
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
@@ -101,19 +130,93 @@ class LLMClient:
     # ---------------------------------------------------------
     # JSON mode (for sub-agents that return structured data)
     # ---------------------------------------------------------
-    async def call_json(self, system_prompt: str, messages: list, model: str = None) -> dict:
+    async def call_json(self, system_prompt: str, messages: list, model: str = None,
+                        speculative_after_ms: int = None) -> dict:
+        """
+        JSON-mode call. Identical requests already in flight (same system
+        prompt, messages and model) share one provider call; callers that join
+        an existing call get a copy of its result with zero usage, so tokens
+        are only counted once.
+
+        speculative_after_ms (default config.LLM_HEDGE_AFTER_MS) hedges slow
+        calls: a duplicate request is sent after that delay and the first
+        successful response wins.
+        """
         model = model or self.model
+        if speculative_after_ms is None:
+            speculative_after_ms = config.LLM_HEDGE_AFTER_MS
+        key = self._request_key(system_prompt, messages, model)
+
+        entry = self._inflight.get(key)
+        joined = entry is not None
+        if not joined:
+            task = asyncio.ensure_future(self._call_json(system_prompt, messages, model, speculative_after_ms))
+            entry = self._inflight[key] = {"task": task, "waiters": 0}
+            task.add_done_callback(
+                lambda _t, k=key, e=entry: self._inflight.pop(k) if self._inflight.get(k) is e else None
+            )
+
+        entry["waiters"] += 1
+        try:
+            result = await asyncio.shield(entry["task"])
+        finally:
+            entry["waiters"] -= 1
+            if not entry["waiters"] and not entry["task"].done():
+                # Every caller gave up (e.g. a cancelled speculative call)
+                entry["task"].cancel()
+
+        if joined:
+            print("  [LLM] call_json deduplicated with an in-flight request")
+            return {**result, "content": copy.deepcopy(result.get("content")),
+                    "input_tokens": 0, "output_tokens": 0}
+        return result
+
+    @staticmethod
+    def _request_key(system_prompt: str, messages: list, model: str) -> str:
+        payload = orjson.dumps([system_prompt, messages, model], option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    async def _call_json(self, system_prompt: str, messages: list, model: str, speculative_after_ms: int = None) -> dict:
         self._debug_log_input("call_json", system_prompt, messages, model)
-        if self.provider == "openai":
-            result = await self._call_openai_json(system_prompt, messages, model)
-        elif self.provider == "anthropic":
-            result = await self._call_anthropic_json(system_prompt, messages, model)
+        if speculative_after_ms:
+            result = await self._call_json_hedged(system_prompt, messages, model, speculative_after_ms)
+        else:
+            result = await self._call_provider_json(system_prompt, messages, model)
         self._debug_log_output(
             "call_json", result.get("content", result),
             {"input_tokens": result.get("input_tokens", 0), "output_tokens": result.get("output_tokens", 0)},
         )
         return result
 
+    async def _call_provider_json(self, system_prompt: str, messages: list, model: str) -> dict:
+        if self.provider == "openai":
+            return await self._call_openai_json(system_prompt, messages, model)
+        elif self.provider == "anthropic":
+            return await self._call_anthropic_json(system_prompt, messages, model)
+
+    async def _call_json_hedged(self, system_prompt: str, messages: list, model: str, after_ms: int) -> dict:
+        """Send a duplicate request if the first is slower than after_ms; first success wins."""
+        pending = {asyncio.ensure_future(self._call_provider_json(system_prompt, messages, model))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=after_ms / 1000)
+            if not done:
+                print(f"  [LLM] call_json slower than {after_ms}ms, sending hedge request")
+                pending.add(asyncio.ensure_future(self._call_provider_json(system_prompt, messages, model)))
+
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Cancel the losing (or orphaned) request
+            for task in pending:
+                task.cancel()
+
     # ---------------------------------------------------------
     # OpenAI implementations
     # ---------------------------------------------------------
@@ -200,10 +303,19 @@ class LLMClient:
     # ---------------------------------------------------------
     # Anthropic implementations
     # ---------------------------------------------------------
+    @staticmethod
+    def _anthropic_system(system_prompt: str):
+        """System prompt as a cache breakpoint when ANTHROPIC_PROMPT_CACHE is on."""
+        if config.ANTHROPIC_PROMPT_CACHE:
+            # Static per agent: later calls read the cached prefix instead of
+            # re-processing it (prompts under the model's minimum aren't cached)
+            return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return system_prompt
+
     async def _call_anthropic(self, system_prompt: str, messages: list, tools: list = None, model: str = None, max_tokens: int = 4096) -> dict:
         kwargs = {
             "model": model or self.model,
-            "system": system_prompt,
+            "system": self._anthropic_system(system_prompt),
             "messages": messages,
             "max_tokens": max_tokens,
         }
@@ -239,7 +351,7 @@ class LLMClient:
         system_with_json = system_prompt + "\n\nYou MUST respond with valid JSON only. No other text."
         kwargs = {
             "model": model or self.model,
-            "system": system_with_json,
+            "system": self._anthropic_system(system_with_json),
             "messages": messages,
             "max_tokens": 4096,
         }
@@ -262,13 +374,19 @@ class LLMClient:
             "content": content,
             "input_tokens": usage.get("input_tokens", 0),
             "output_tokens": usage.get("output_tokens", 0),
+            "cache_read_input_tokens": usage.get("cache_read_input_tokens", 0),
+            "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0),
         }
 
     def _extract_anthropic_usage(self, response) -> dict:
         if response.usage:
+            # Prompt-cache reads and writes are billed at different rates
+            # from input_tokens, so they stay separate keys
             return {
                 "input_tokens": response.usage.input_tokens or 0,
                 "output_tokens": response.usage.output_tokens or 0,
+                "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", 0) or 0,
+                "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", 0) or 0,
             }
         return {"input_tokens": 0, "output_tokens": 0}
 
@@ -333,7 +451,7 @@ class LLMClient:
         print(f"  [LLM] Anthropic stream: model={model}, max_tokens={max_tokens}")
         async with self.client.messages.stream(
             model=model,
-            system=system_prompt,
+            system=self._anthropic_system(system_prompt),
             messages=messages,
             max_tokens=max_tokens,
         ) as stream:
@@ -341,11 +459,7 @@ class LLMClient:
                 yield text
             message = await stream.get_final_message()
             print(f"  [LLM] Anthropic stream stop_reason={message.stop_reason}")
-            yield {
-                "type": "usage",
-                "input_tokens": message.usage.input_tokens or 0,
-                "output_tokens": message.usage.output_tokens or 0,
-            }
+            yield {"type": "usage", **self._extract_anthropic_usage(message)}
 
     # ---------------------------------------------------------
     # Tool result formatting (provider-specific)
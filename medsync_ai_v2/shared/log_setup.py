@@ -0,0 +1,42 @@
+"""
+MedSync AI v2 - Logging Setup
+
+Routes the medsync_ai_v2 logger tree through a QueueHandler so request
+coroutines only enqueue records; a QueueListener thread formats and writes
+them to stdout.
+"""
+
+import sys
+import queue
+import logging
+import logging.handlers
+from medsync_ai_v2 import config
+
+_listener: logging.handlers.QueueListener = None
+
+
+def configure_logging():
+    """Install the queue handler on the package logger (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("  %(message)s"))
+
+    package_logger = logging.getLogger("medsync_ai_v2")
+    package_logger.setLevel(config.LOG_LEVEL)
+    package_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    package_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    _listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread (app shutdown)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
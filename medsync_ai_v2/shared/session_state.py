@@ -135,6 +135,47 @@ class SessionManager:
         self.locks.pop((uid, session_id), None)
 
 
+# Rolling window of recent user/assistant turns kept alongside the full history
+RECENT_TURNS_MAX = 6
+
+
+def append_turn(session_state: dict, message: dict):
+    """
+    Append a message to conversation_history and the recent_turns window.
+
+    recent_turns holds the last RECENT_TURNS_MAX user/assistant messages as
+    {"role", "content"} pairs, ready to pass to an LLM without re-scanning the
+    history. It is a plain list (not a deque) so the session stays Firestore-safe.
+    last_user_message tracks the content of the latest user message.
+    """
+    history = session_state.setdefault("conversation_history", [])
+    history.append(message)
+    if message.get("role") == "user" and message.get("content"):
+        session_state["last_user_message"] = message["content"]
+    if message.get("role") in ("user", "assistant"):
+        recent = session_state.get("recent_turns")
+        if recent is None:
+            # Session saved before recent_turns existed: seed the window from
+            # the history (which already holds this message)
+            session_state["recent_turns"] = [
+                {"role": m["role"], "content": m["content"]}
+                for m in history
+                if m.get("role") in ("user", "assistant")
+            ][-RECENT_TURNS_MAX:]
+            return
+        recent.append({"role": message["role"], "content": message["content"]})
+        if len(recent) > RECENT_TURNS_MAX:
+            del recent[:-RECENT_TURNS_MAX]
+
+
+def has_prior_turns(history: list, raw_query: str) -> bool:
+    """True if history holds any turn other than the current user message."""
+    prior = history
+    if history and history[-1].get("content") == raw_query:
+        prior = history[:-1]
+    return any(m.get("role") in ("user", "assistant") for m in prior)
+
+
 def sanitize_for_firestore(value):
     """Recursively ensure all dict keys are valid Firestore field paths."""
     if isinstance(value, dict):
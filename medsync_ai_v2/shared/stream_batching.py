@@ -0,0 +1,69 @@
+"""
+MedSync AI v2 - Stream Batching
+
+Coalesces the text chunks of an LLMClient.call_stream() into micro-batches
+so output agents put one final_chunk event per batch instead of per token.
+A batch is released when it holds max_chunks chunks or max_delay seconds
+after its first chunk, whichever comes first — also while the model is
+pausing, so held text never waits for the next token.
+"""
+
+import asyncio
+
+
+async def batch_stream(stream, max_delay: float, max_chunks: int = 8):
+    """
+    Re-yield stream with consecutive str chunks joined into batches.
+
+    Non-str items (the trailing usage dict) flush the pending batch and are
+    passed through unchanged. max_delay <= 0 passes the stream through as-is.
+    """
+    if max_delay <= 0:
+        async for chunk in stream:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    it = stream.__aiter__()
+    buffer = []
+    deadline = None
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(it.__anext__())
+            if buffer:
+                # Wait for the next chunk only until the batch is due
+                done, _ = await asyncio.wait({pending}, timeout=max(deadline - loop.time(), 0))
+                if not done:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    continue
+            else:
+                await asyncio.wait({pending})
+
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                pending = None
+
+            if isinstance(chunk, str):
+                if not buffer:
+                    deadline = loop.time() + max_delay
+                buffer.append(chunk)
+                if len(buffer) >= max_chunks:
+                    yield "".join(buffer)
+                    buffer.clear()
+            else:
+                if buffer:
+                    yield "".join(buffer)
+                    buffer.clear()
+                yield chunk
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -8,12 +8,34 @@ OpenAI's Vector Stores. Used by the VectorEngine.
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 
 
 VECTOR_STORE_ID = os.getenv(
     "VECTOR_STORE_ID", "vs_691fa5db72588191bc6ad42ecfdf8489"
 )
 
+# Keep-alive connection pool shared by every VectorStoreClient (searches run
+# in worker threads, so size the pool for parallel asyncio.to_thread calls)
+_session: requests.Session = None
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        _session.mount("https://", adapter)
+    return _session
+
+
+def close_session():
+    """Close the shared connection pool (app shutdown)."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
 
 class VectorStoreClient:
     """Searches OpenAI Vector Store for relevant document chunks."""
@@ -45,7 +67,7 @@ class VectorStoreClient:
         if filters:
             payload["filters"] = filters
 
-        response = requests.post(
+        response = _get_session().post(
             url,
             headers=self.headers,
             data=json.dumps(payload),
@@ -0,0 +1,72 @@
+"""Question/device tables for the deterministic GenericPrep rules."""
+
+import pytest
+
+from medsync_ai_v2.engines.devices.generic_prep.generic_prep_rules import resolve_generic_device
+
+CATHETER_6F = {
+    "raw": "6F catheter, 100 cm",
+    "device_type": "catheter",
+    "attributes": {"size": {"value": 6, "unit": "F"}, "length": {"value": 100, "unit": "cm"}},
+}
+
+OD_6F = {
+    "logic_category": "catheter",
+    "specification_length_cm": 100.0,
+    "specification_outer-diameter-distal_F": 6,
+    "specification_outer-diameter-proximal_F": 6,
+}
+ID_6F = {
+    "logic_category": "catheter",
+    "specification_length_cm": 100.0,
+    "specification_inner-diameter_F": 6,
+}
+LLM = None
+INSUFFICIENT = "insufficient"
+
+
+@pytest.mark.parametrize("question, expected", [
+    # "catheter" must not anchor inside "microcatheter": this catheter receives it
+    ("Can I run the Phenom 21 microcatheter through a 6F catheter that is 100cm long?", ID_6F),
+    ("Will a 6F catheter that is 100cm long fit into the Neuron Max?", OD_6F),
+    ("Does a 6F 100cm catheter accept the Phenom 21?", ID_6F),
+    ("Which sheath accepts a 6F 100cm catheter?", OD_6F),
+    # Ambiguous phrasing anywhere in the question goes to the LLM
+    ("Can I use a 6F 100cm catheter with a Solitaire that goes into the Vecta?", LLM),
+    ("Is a 6F 100cm catheter compatible with the Solitaire?", LLM),
+    ("What is the correct order for a 6F 100cm catheter and a Solitaire?", LLM),
+    # More than one relation keyword
+    ("Does the Phenom 21 go through a 6F 100cm catheter that fits into the Neuron Max?", LLM),
+    # Anchor not unique
+    ("Can a 6F 100cm catheter go inside another catheter?", LLM),
+    # No relation stated: both diameters needed
+    ("Find a 6F 100cm catheter", INSUFFICIENT),
+])
+def test_single_diameter_role(question, expected):
+    result = resolve_generic_device(CATHETER_6F, question)
+    if expected is LLM:
+        assert result is None
+    elif expected == INSUFFICIENT:
+        assert result["has_info"] is False
+    else:
+        assert result["has_info"] is True
+        assert result["search_criteria"] == expected
+
+
+@pytest.mark.parametrize("device, expected", [
+    ({"device_type": "wire", "attributes": {"size": None}}, LLM),
+    ({"device_type": "wire", "attributes": {"size": {"value": 0.014, "unit": "in"}}},
+     {"logic_category": "wire",
+      "specification_outer-diameter-distal_in": 0.014,
+      "specification_outer-diameter-proximal_in": 0.014}),
+    ({"device_type": "wire", "attributes": {}}, INSUFFICIENT),
+    ({"device_type": "coil", "attributes": {"size": {"value": 4, "unit": "mm"}}}, LLM),
+])
+def test_wire_and_unknown_devices(device, expected):
+    result = resolve_generic_device(device, "Will it fit into a 6F catheter?")
+    if expected is LLM:
+        assert result is None
+    elif expected == INSUFFICIENT:
+        assert result["has_info"] is False
+    else:
+        assert result["search_criteria"] == expected
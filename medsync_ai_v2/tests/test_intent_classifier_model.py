@@ -0,0 +1,36 @@
+"""Known queries pinned to their local intent-classifier labels."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+
+from medsync_ai_v2.engines.devices.intent_classifier.intent_classifier_model import get_intent_model
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_intent_model()
+
+
+@pytest.mark.parametrize("query, label", [
+    ("What is the outer diameter of the Trak 21?", "specification_lookup"),
+    ("Which company makes the Phenom 21?", "manufacturer_lookup"),
+    ("Compare Headway 17 and Phenom 27", "device_comparison"),
+    ("What is an aspiration catheter?", "device_definition"),
+    ("What does the Vecta 46 IFU say about contraindications?", "documentation"),
+])
+def test_known_queries(model, query, label):
+    assert model.predict(query)[0] == label
+
+
+@pytest.mark.parametrize("query", [
+    "What's the weather in Paris tomorrow?",
+    "Write me a haiku about autumn",
+])
+def test_off_topic_queries_go_to_the_llm(model, query):
+    assert model.classify(query) is None
+
+
+def test_multi_part_queries_go_to_the_llm(model):
+    assert model.classify("What is the OD of Vecta 46? And who makes it?") is None